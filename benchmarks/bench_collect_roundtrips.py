@@ -0,0 +1,90 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, time
+from common import CallCounter, make_driver
+from fixture_server import FixtureServer
+from ig_cleaner import DialogHarvester, UserCollector
+from selenium.webdriver.common.by import By
+
+SCROLL = "arguments[0].scrollTo(0, arguments[0].scrollHeight); return arguments[0].scrollHeight;"
+
+
+def legacy_pass(driver, box, users):
+    for link in box.find_elements(By.TAG_NAME, "a"):
+        href = link.get_attribute("href")
+        if href:
+            users.add(href.rstrip("/").split("/")[-1])
+
+
+def run(driver, counter, url, total, mode, wait):
+    driver.get(url)
+    box = driver.find_element(By.ID, "box")
+    users = set()
+    counter.reset()
+    started = time.perf_counter()
+    if mode == "observer":
+        collector = DialogHarvester(driver, box, timeout=2).start()
+        last_height = 0
+        while True:
+            users.update(collector.collect())
+            height = collector.advance()
+            if height == last_height:
+                break
+            last_height = height
+        users.update(collector.collect())
+        collector.stop()
+        return len(users), counter.count, time.perf_counter() - started
+    collector = UserCollector(driver, box)
+    idle = 0
+    while len(users) < total and idle < 20:
+        before = len(users)
+        if mode == "legacy":
+            legacy_pass(driver, box, users)
+        else:
+            users.update(collector.collect())
+        driver.execute_script(SCROLL, box)
+        time.sleep(wait)
+        idle = idle + 1 if len(users) == before else 0
+    elapsed = time.perf_counter() - started
+    return len(users), counter.count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="WebDriver calls per collected user: per-link vs bulk vs observer."
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument(
+        "--delay", type=int, default=150, help="fixture render delay in ms"
+    )
+    parser.add_argument(
+        "--wait", type=float, default=0.3, help="fixed sleep after each scroll"
+    )
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+    driver = make_driver(headless=not args.headed)
+    counter = CallCounter(driver)
+    try:
+        with FixtureServer() as server:
+            print(
+                f"{'users':>8} {'mode':>8} {'calls':>9} {'calls/user':>11} {'secs':>8}"
+            )
+            for total in args.users:
+                url = server.url(f"/dialog?n={total}&batch=50&delay={args.delay}")
+                for mode in ("legacy", "bulk", "observer"):
+                    got, calls, secs = run(driver, counter, url, total, mode, args.wait)
+                    print(
+                        f"{got:>8} {mode:>8} {calls:>9} "
+                        f"{calls / max(got, 1):>11.2f} {secs:>8.2f}"
+                    )
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
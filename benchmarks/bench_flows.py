@@ -0,0 +1,147 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, builtins, glob, json, logging, os, shutil, tempfile, time
+from common import CallCounter, ScriptedConsole, make_driver
+from fixture_server import FixtureServer
+
+ACCOUNT = "bench"
+
+
+def run_flow(ig_cleaner, server, flow, mode, args):
+    counters = []
+
+    def driver_factory():
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        if mode == "network":
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        driver = make_driver(headless=not args.headed, options=options)
+        if mode == "network":
+            driver.execute_cdp_cmd("Network.enable", {})
+        counters.append(CallCounter(driver))
+        return driver
+
+    answers = {
+        "export": [ACCOUNT, "following", "txt"],
+        "nonfollowers": [ACCOUNT],
+        "unfollow_all": [ACCOUNT],
+    }[flow]
+    menu = ig_cleaner.MainMenu(
+        ScriptedConsole(answers),
+        logging.getLogger("bench"),
+        None,
+        None,
+        None,
+        None,
+        driver_factory=driver_factory,
+    )
+    action = {
+        "export": menu.export_follow_data,
+        "nonfollowers": menu.unfollow_non_followers,
+        "unfollow_all": menu.start_unfollow,
+    }[flow]
+    before = len(server.unfollowed)
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    scanned = 0
+    if flow == "export":
+        for path in glob.glob(os.path.join("exports", f"{ACCOUNT}_following_*.txt")):
+            with open(path, encoding="utf-8") as f:
+                scanned = sum(1 for _ in f)
+    elif flow == "nonfollowers":
+        store = ig_cleaner.SnapshotStore()
+        for list_type in ["followers", "following"]:
+            latest = store.latest(ACCOUNT, list_type)
+            scanned += latest[2] if latest else 0
+        store.close()
+    else:
+        journal = ig_cleaner.UnfollowJournal(ACCOUNT)
+        scanned = len(journal.planned)
+        journal.close()
+    calls = sum(counter.count for counter in counters)
+    return scanned, len(server.unfollowed) - before, calls, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="End-to-end export / unfollow flows against the fixture server."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--flows",
+        nargs="+",
+        default=["export", "nonfollowers", "unfollow_all"],
+        choices=["export", "nonfollowers", "unfollow_all"],
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=["dom"], choices=["dom", "observer", "network"]
+    )
+    parser.add_argument("--non-followers", type=float, default=0.1)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    # Flows read settings.json and write .meta/ and exports/ in the cwd.
+    workdir = tempfile.mkdtemp(prefix="igc-bench-")
+    cwd = os.getcwd()
+    builtins.input = lambda prompt="": "n"
+    print(
+        f"{'flow':>13} {'mode':>8} {'size':>7} {'scanned':>8} {'unfol':>6} "
+        f"{'secs':>8} {'users/s':>9} {'calls':>7} {'calls/u':>8}"
+    )
+    try:
+        for size in args.sizes:
+            for mode in args.modes:
+                with FixtureServer(
+                    account=ACCOUNT,
+                    followers=size - int(size * args.non_followers),
+                    following=size,
+                    non_followers=int(size * args.non_followers),
+                    batch=args.batch,
+                    render="network" if mode == "network" else "dom",
+                ) as server:
+                    os.environ["IG_CLEANER_BASE_URL"] = server.base_url
+                    import ig_cleaner
+
+                    ig_cleaner.IG_BASE_URL = server.base_url
+                    for flow in args.flows:
+                        run_dir = os.path.join(workdir, f"{flow}-{mode}-{size}")
+                        os.makedirs(run_dir)
+                        os.chdir(run_dir)
+                        with open("settings.json", "w") as f:
+                            json.dump(
+                                {
+                                    "COLLECT_MODE": mode,
+                                    "MAX_SAFE_LIMIT": args.limit,
+                                    "SLEEP_BETWEEN": [0, 0],
+                                    "SLEEP_AFTER_BATCH": 0,
+                                    "HOURLY_LIMIT": 0,
+                                    "DAILY_LIMIT": 0,
+                                },
+                                f,
+                            )
+                        scanned, unfollowed, calls, elapsed = run_flow(
+                            ig_cleaner, server, flow, mode, args
+                        )
+                        os.chdir(cwd)
+                        print(
+                            f"{flow:>13} {mode:>8} {size:>7} {scanned:>8} {unfollowed:>6} "
+                            f"{elapsed:>8.2f} {scanned / elapsed:>9.1f} {calls:>7} "
+                            f"{calls / max(1, scanned):>8.3f}"
+                        )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print("(secs include the fixed sleeps in each flow; unfollow sleeps are zeroed)")
+
+
+if __name__ == "__main__":
+    main()
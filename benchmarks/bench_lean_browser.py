@@ -0,0 +1,76 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, os, shutil, statistics, tempfile, time
+from common import make_driver
+from fixture_server import FixtureServer, username
+
+LOAD_SCRIPT = """
+    const nav = performance.getEntriesByType("navigation")[0];
+    return nav ? nav.loadEventEnd - nav.startTime : null;
+"""
+
+
+def visit(driver, server, users):
+    # Wall time of driver.get, the page's own load time and bytes served.
+    samples, loads = [], []
+    before = server.bytes_sent
+    for user in users:
+        started = time.perf_counter()
+        driver.get(server.url(f"/{user}/"))
+        samples.append(time.perf_counter() - started)
+        loads.append(driver.execute_script(LOAD_SCRIPT) or 0)
+    return samples, loads, server.bytes_sent - before
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile page loads with the default Chrome profile vs LEAN_BROWSER."
+    )
+    parser.add_argument("--profiles", type=int, default=30)
+    parser.add_argument("--media", type=int, default=12)
+    parser.add_argument("--media-kb", type=int, default=64)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+    with FixtureServer(media=args.media, media_kb=args.media_kb) as server:
+        os.environ["IG_CLEANER_BASE_URL"] = server.base_url
+        import ig_cleaner
+
+        from selenium.webdriver.chrome.options import Options
+
+        users = [username(i) for i in range(args.profiles)]
+        print(
+            f"{'profile':>8} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'load ms':>8} {'KB/page':>9}"
+        )
+        for mode in ["default", "lean"]:
+            # A fresh profile per mode so neither run is served from cache.
+            user_data_dir = tempfile.mkdtemp(prefix=f"igc-{mode}-")
+            options = Options()
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+            lean = ig_cleaner.LeanBrowser(user_data_dir, cache_mb=32)
+            if mode == "lean":
+                lean.configure(options)
+            driver = make_driver(headless=not args.headed, options=options)
+            try:
+                if mode == "lean":
+                    lean.attach(driver)
+                samples, loads, sent = visit(driver, server, users)
+            finally:
+                driver.quit()
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(
+                f"{mode:>8} {len(samples):>5} {statistics.median(samples) * 1000:>8.1f} "
+                f"{p95 * 1000:>8.1f} {statistics.median(loads):>8.1f} "
+                f"{sent / 1024 / len(users):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, time
+from common import CallCounter, make_driver
+from fixture_server import FixtureServer
+from ig_cleaner import NetworkCollector, UserCollector
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+
+
+def run(driver, counter, url, list_type, mode):
+    driver.get(url)
+    box = driver.find_element(By.ID, "box")
+    if mode == "network":
+        collector = NetworkCollector(driver, box, list_type, timeout=3).start()
+    else:
+        collector = UserCollector(driver, box, wait_time=0.5).start()
+    users = set()
+    counter.reset()
+    started = time.perf_counter()
+    for batch in collector.batches():
+        users.update(batch)
+    collector.stop()
+    return users, counter.count, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline check of CDP network capture against the fixture API."
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[240, 1200])
+    parser.add_argument("--list", dest="list_type", default="followers")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+    options = Options()
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = make_driver(headless=not args.headed, options=options)
+    driver.execute_cdp_cmd("Network.enable", {})
+    counter = CallCounter(driver)
+    failures = 0
+    try:
+        with FixtureServer() as server:
+            print(f"{'expected':>9} {'mode':>8} {'got':>7} {'calls':>7} {'secs':>7}")
+            for total in args.users:
+                url = server.url(f"/netdialog?list={args.list_type}&n={total}")
+                for mode in ("dom", "network"):
+                    driver.get_log("performance")
+                    users, calls, secs = run(driver, counter, url, args.list_type, mode)
+                    status = "" if len(users) == total else "  MISMATCH"
+                    failures += bool(status)
+                    print(
+                        f"{total:>9} {mode:>8} {len(users):>7} {calls:>7} "
+                        f"{secs:>7.2f}{status}"
+                    )
+    finally:
+        driver.quit()
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
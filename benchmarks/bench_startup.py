@@ -0,0 +1,93 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, json, os, shutil, statistics, subprocess, sys, tempfile
+from common import ROOT
+
+# Runs in a fresh interpreter: import the module, build SystemSetup and draw
+# the menu (output discarded), then report the elapsed time and which heavy
+# modules got loaded on the way.
+PROBE = """
+import io, json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import ig_cleaner
+setup = ig_cleaner.SystemSetup()
+setup.console.console.file = io.StringIO()
+ig_cleaner.MainMenu(
+    setup.console, setup.logger, setup.cmd, setup.logo, setup.deps, setup
+).display_menu()
+elapsed = time.perf_counter() - started
+print("\\n" + json.dumps({
+    "secs": elapsed,
+    "selenium": "selenium" in sys.modules,
+    "pandas": "pandas" in sys.modules,
+}))
+"""
+
+
+def measure(source_dir, runs):
+    samples, last = [], {}
+    workdir = tempfile.mkdtemp(prefix="igc-startup-")
+    try:
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, "-c", PROBE, source_dir],
+                cwd=workdir,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            last = json.loads(output.strip().splitlines()[-1])
+            samples.append(last["secs"])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return samples, last
+
+
+def checkout(rev):
+    source = subprocess.run(
+        ["git", "show", f"{rev}:ig_cleaner.py"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    directory = tempfile.mkdtemp(prefix="igc-rev-")
+    with open(os.path.join(directory, "ig_cleaner.py"), "w", encoding="utf-8") as f:
+        f.write(source)
+    return directory
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time from interpreter start to the drawn main menu."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--baseline", help="git revision to compare against, e.g. HEAD~1"
+    )
+    args = parser.parse_args()
+    targets = [("current", ROOT)]
+    if args.baseline:
+        targets.insert(0, (args.baseline, checkout(args.baseline)))
+    print(f"{'version':>10} {'p50 ms':>8} {'min ms':>8} {'selenium':>9} {'pandas':>7}")
+    try:
+        for label, directory in targets:
+            samples, last = measure(directory, args.runs)
+            print(
+                f"{label:>10} {statistics.median(samples) * 1000:>8.1f} "
+                f"{min(samples) * 1000:>8.1f} {str(last['selenium']):>9} "
+                f"{str(last['pandas']):>7}"
+            )
+    finally:
+        if args.baseline:
+            shutil.rmtree(targets[0][1], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, os, statistics, time
+from common import make_driver
+from fixture_server import FixtureServer, username
+
+
+def measure(fn, users):
+    samples = []
+    for user in users:
+        started = time.perf_counter()
+        fn(user)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(label, samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{label:>8} {len(samples):>6} {statistics.median(samples) * 1000:>9.1f} "
+        f"{p95 * 1000:>9.1f} {sum(samples):>8.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-unfollow latency: in-dialog row click vs profile page load."
+    )
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--targets", type=int, default=20)
+    parser.add_argument("--profile-kb", type=int, default=200)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+    with FixtureServer(profile_kb=args.profile_kb) as server:
+        os.environ["IG_CLEANER_BASE_URL"] = server.base_url
+        import ig_cleaner
+
+        from selenium.webdriver.common.by import By
+
+        menu = ig_cleaner.MainMenu(None, None, None, None, None, None)
+        driver = make_driver(headless=not args.headed)
+        try:
+            step = max(1, args.users // args.targets)
+            targets = [username(i) for i in range(0, args.users, step)][: args.targets]
+            driver.get(server.url(f"/dialog?n={args.users}&batch={args.users}"))
+            box = driver.find_element(By.ID, "box")
+            rows = ig_cleaner.DialogRows(driver, box)
+            dialog = measure(
+                lambda user: menu.unfollow_from_dialog(driver, rows, user), targets
+            )
+            profile = measure(
+                lambda user: menu.unfollow_from_profile(driver, user), targets
+            )
+        finally:
+            driver.quit()
+    print(f"{'route':>8} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'total s':>8}")
+    report("dialog", dialog)
+    report("profile", profile)
+    print("(profile route includes the fixed 2 s post-navigation wait)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import argparse, builtins, cProfile, json, logging, os, pstats, shutil, sys, tempfile, time
+from common import ScriptedConsole
+from fake_driver import FakeDriver, VirtualClock
+from fixture_server import username
+import ig_cleaner
+
+ACCOUNT = "bench"
+
+
+def expected_cooldowns(total, limit, batch_delay, batches=None):
+    cooldowns = 0
+    while total > 0 and batches != 0:
+        batch = min(limit, total)
+        cooldowns += batch // batch_delay
+        total -= batch
+        batches = None if batches is None else batches - 1
+    return cooldowns
+
+
+class LogCounter(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Multi-batch start_unfollow (or the non-follower flow) against the in-memory fake driver, in virtual time."
+    )
+    parser.add_argument("--flow", choices=["all", "nonfollowers"], default="all")
+    parser.add_argument("--following", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=150)
+    parser.add_argument("--batch-delay", type=int, default=20)
+    parser.add_argument("--hourly", type=int, default=60)
+    parser.add_argument("--daily", type=int, default=0)
+    parser.add_argument("--page", type=int, default=12)
+    parser.add_argument("--block-every", type=int, default=0)
+    parser.add_argument("--block-for", type=int, default=3600)
+    parser.add_argument("--non-followers", type=int, default=100)
+    parser.add_argument("--load-time", type=float, default=0)
+    parser.add_argument("--no-prefetch", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="igc-virtual-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    batches = []
+    builtins.input = lambda prompt="": batches.append(prompt) or "y"
+    try:
+        with open("settings.json", "w") as f:
+            json.dump(
+                {
+                    "COLLECT_MODE": "dom",
+                    "MAX_SAFE_LIMIT": args.limit,
+                    "BATCH_DELAY": args.batch_delay,
+                    "HOURLY_LIMIT": args.hourly,
+                    "DAILY_LIMIT": args.daily,
+                    "RATE_MAX_WAIT": 10**9,
+                    "UNFOLLOW_IN_DIALOG": args.flow == "all",
+                    "PREFETCH_PROFILES": not args.no_prefetch,
+                },
+                f,
+            )
+        users = [username(i) for i in range(args.following)]
+        followers = users if args.flow == "all" else users[args.non_followers :]
+        clock = VirtualClock()
+        driver = FakeDriver(
+            ACCOUNT,
+            followers,
+            users,
+            batch=args.page,
+            clock=clock,
+            block_every=args.block_every or None,
+            block_for=args.block_for,
+            load_time=args.load_time,
+        )
+        console = ScriptedConsole([ACCOUNT])
+        logger = logging.getLogger("bench")
+        logger.setLevel(logging.INFO)
+        log = LogCounter()
+        logger.addHandler(log)
+        menu = ig_cleaner.MainMenu(
+            console,
+            logger,
+            None,
+            None,
+            None,
+            None,
+            clock=clock,
+            driver_factory=lambda: driver,
+        )
+        profiler = cProfile.Profile() if args.profile else None
+        started = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        if args.flow == "all":
+            menu.start_unfollow()
+        else:
+            menu.unfollow_non_followers()
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = console.output()
+    cooldowns = sum(m.startswith("Cooling down") for m in log.messages)
+    if args.flow == "all":
+        target = args.following
+        expected = expected_cooldowns(target, args.limit, args.batch_delay)
+    else:
+        target = min(args.non_followers, args.limit)
+        expected = expected_cooldowns(target, args.limit, args.batch_delay, 1)
+    unfollowed = len(driver.unfollowed)
+    print(f"unfollowed      {unfollowed} / {target}")
+    print(f"batches         {output.count('Batch unfollow limit')}")
+    print(f"cooldowns       {cooldowns} (expected {expected})")
+    if args.block_every:
+        print(
+            f"blocks          {driver.blocks} (pauses {output.count('being limited')})"
+        )
+    print(f"virtual time    {clock.elapsed / 3600:.2f} h in {clock.sleeps} sleeps")
+    if driver.unfollowed_at:
+        print(
+            f"first unfollow  {driver.unfollowed_at[0] - clock.started:.1f} s (virtual)"
+        )
+    print(
+        f"wall time       {wall:.3f} s ({wall / max(1, unfollowed) * 1000:.3f} ms/unfollow)"
+    )
+    print(
+        f"driver commands {driver.commands} ({driver.commands / max(1, unfollowed):.1f}/unfollow)"
+    )
+    print(f"page loads      {driver.loads} in {len(driver.window_handles)} tab(s)")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    if unfollowed != target or (cooldowns != expected and not args.block_every):
+        print("MISMATCH")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import io, os, sys, platform
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class CallCounter:
+    def __init__(self, driver):
+        self.count = 0
+        original = driver.execute
+
+        def execute(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        driver.execute = execute
+
+    def reset(self):
+        self.count = 0
+
+
+class ScriptedConsole:
+    # Stands in for ConsoleHelper: prompts are answered from a list and the
+    # output is kept in memory.
+    def __init__(self, answers):
+        from rich.console import Console
+
+        self.console = Console(file=io.StringIO(), width=120)
+        self.answers = list(answers)
+
+    def prompt_choice(self, prompt, choices=None):
+        return self.answers.pop(0) if self.answers else ""
+
+    def print(self, msg, style=None):
+        self.console.print(f"[{style}]{msg}[/{style}]" if style else msg)
+
+    def output(self):
+        return self.console.file.getvalue()
+
+
+def make_driver(headless=True, options=None):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = options or Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,900")
+    name = "chromedriver.exe" if platform.system() == "Windows" else "chromedriver"
+    driver_path = os.path.join(ROOT, "drivers", name)
+    service = Service(driver_path) if os.path.exists(driver_path) else Service()
+    return webdriver.Chrome(service=service, options=options)
@@ -0,0 +1,334 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import random, re, time
+from urllib.parse import urlparse
+from ig_cleaner import ActionCheck, Clock, DialogRows, UserCollector
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+ROW_HEIGHT = 54
+NAVIGATE_SCRIPT = "window.location.href = arguments[0];"
+TAB_STATE = [
+    "origin",
+    "current_url",
+    "profile",
+    "dialog",
+    "rendered",
+    "returned",
+    "confirming",
+    "ready_at",
+]
+LIST_PATH = re.compile(r"^/([^/]+)/(followers|following)/$")
+PROFILE_PATH = re.compile(r"^/([^/]+)/$")
+
+
+class VirtualClock(Clock):
+    # Sleeps advance a counter instead of blocking; jitter is seeded.
+    def __init__(self, start=None, seed=0):
+        self.now = time.time() if start is None else start
+        self.started = self.now
+        self.slept = 0.0
+        self.sleeps = 0
+        self.random = random.Random(seed)
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+            self.slept += seconds
+            self.sleeps += 1
+
+    def uniform(self, low, high):
+        return self.random.uniform(low, high)
+
+    @property
+    def elapsed(self):
+        return self.now - self.started
+
+
+class FakeElement:
+    def __init__(self, driver, kind, text="", title=None, target=None):
+        self.driver = driver
+        self.kind = kind
+        self.text = text
+        self.title = title
+        self.target = target
+
+    def get_attribute(self, name):
+        self.driver._command()
+        return self.title if name == "title" else None
+
+    def is_displayed(self):
+        self.driver._command()
+        return True
+
+    def is_enabled(self):
+        self.driver._command()
+        return True
+
+    def click(self):
+        self.driver._command()
+        self.driver._click(self)
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind="tab"):
+        self.driver._new_tab()
+
+    def window(self, handle):
+        self.driver._switch(handle)
+
+
+class FakeDriver:
+    # In-memory model of the pages MainMenu drives: the login redirect, a
+    # profile with follower/following links, the lazily rendered dialog that
+    # UserCollector and DialogRows script against, and the Unfollow
+    # confirmation. Only the "dom" COLLECT_MODE is modelled. With
+    # block_every, every that many unfollows Instagram's "Try Again Later"
+    # block kicks in for block_for seconds and confirmations do nothing.
+    # Each page load takes load_time virtual seconds: driver.get waits for
+    # it, a script navigation in another tab loads in the background. After
+    # crash_after unfollows the browser dies and every command fails with
+    # "invalid session id"; loading a profile named in unreachable fails
+    # with a network error.
+    def __init__(
+        self,
+        account,
+        followers,
+        following,
+        batch=12,
+        clock=None,
+        block_every=None,
+        block_for=3600,
+        load_time=0,
+        crash_after=None,
+        unreachable=(),
+    ):
+        self.account = account
+        self.clock = clock or Clock()
+        self.lists = {"followers": list(followers), "following": list(following)}
+        self.positions = {
+            name: {user: i for i, user in enumerate(users)}
+            for name, users in self.lists.items()
+        }
+        self.followed = set(following)
+        self.unfollowed = []
+        self.unfollowed_at = []
+        self.batch = batch
+        self.commands = 0
+        self.origin = "https://www.instagram.com"
+        self.current_url = ""
+        self.profile = None
+        self.dialog = None
+        self.rendered = 0
+        self.returned = 0
+        self.confirming = None
+        self.closed = False
+        self.block_every = block_every
+        self.block_for = block_for
+        self.blocked_until = 0
+        self.block_shown = False
+        self.blocks = 0
+        self.load_time = load_time
+        self.ready_at = 0
+        self.tabs = {}
+        self.current_window_handle = "tab-0"
+        self.window_handles = ["tab-0"]
+        self.opened = 0
+        self.switch_to = FakeSwitchTo(self)
+        self.loads = 0
+        self.crash_after = crash_after
+        self.unreachable = set(unreachable)
+
+    def _command(self):
+        self.commands += 1
+        if self.crash_after is not None and len(self.unfollowed) >= self.crash_after:
+            raise WebDriverException("invalid session id")
+
+    def get(self, url):
+        self._command()
+        match = PROFILE_PATH.match(urlparse(url).path)
+        if match and match.group(1) in self.unreachable:
+            raise WebDriverException("unknown error: net::ERR_CONNECTION_RESET")
+        self._navigate(url)
+        self._wait_ready()
+
+    def _navigate(self, url):
+        self.loads += 1
+        self.ready_at = self.clock.time() + self.load_time
+        parsed = urlparse(url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        path = parsed.path
+        self.dialog = None
+        self.confirming = None
+        if path.startswith("/accounts/login"):
+            # Already logged in: Instagram bounces straight to the feed.
+            path = "/"
+        self.current_url = self.origin + path
+        match = LIST_PATH.match(path) or PROFILE_PATH.match(path)
+        self.profile = match.group(1) if match else None
+        if match and match.re is LIST_PATH:
+            self.open_dialog(match.group(2))
+
+    def _wait_ready(self):
+        self.clock.sleep(self.ready_at - self.clock.time())
+
+    def _new_tab(self):
+        self._command()
+        self.tabs[self.current_window_handle] = {
+            name: getattr(self, name) for name in TAB_STATE
+        }
+        self.opened += 1
+        handle = f"tab-{self.opened}"
+        self.window_handles.append(handle)
+        self.current_window_handle = handle
+        self.current_url = "about:blank"
+        self.profile = self.dialog = self.confirming = None
+        self.rendered = self.returned = self.ready_at = 0
+
+    def _switch(self, handle):
+        self._command()
+        if handle == self.current_window_handle:
+            return
+        if handle not in self.window_handles:
+            raise WebDriverException(f"no such window: {handle}")
+        if self.current_window_handle is not None:
+            self.tabs[self.current_window_handle] = {
+                name: getattr(self, name) for name in TAB_STATE
+            }
+        for name, value in self.tabs.pop(handle).items():
+            setattr(self, name, value)
+        self.current_window_handle = handle
+
+    def open_dialog(self, list_type):
+        self.dialog = list_type
+        self.rendered = min(self.batch, len(self.rows()))
+        self.returned = 0
+        self.current_url = f"{self.origin}/{self.profile}/{list_type}/"
+
+    def rows(self):
+        if self.profile != self.account or self.dialog is None:
+            return []
+        return self.lists[self.dialog]
+
+    def count(self, list_type):
+        return len(self.lists[list_type]) if self.profile == self.account else 0
+
+    def find_element(self, by=None, value=None):
+        self._command()
+        self._wait_ready()
+        element = self._locate(value or "")
+        if element is None:
+            raise NoSuchElementException(f"fake driver: no element for {value}")
+        return element
+
+    def find_elements(self, by=None, value=None):
+        try:
+            return [self.find_element(by, value)]
+        except NoSuchElementException:
+            return []
+
+    def _locate(self, xpath):
+        if "button" in xpath and "Unfollow" in xpath:
+            if self.confirming:
+                return FakeElement(self, "confirm", "Unfollow")
+            return None
+        if "button" in xpath and "Following" in xpath:
+            if self.profile and self.dialog is None and self.profile in self.followed:
+                return FakeElement(self, "follow", "Following", target=self.profile)
+            return None
+        if "@role='dialog'" in xpath:
+            return FakeElement(self, "box") if self.dialog else None
+        for list_type in ["followers", "following"]:
+            if f"/{list_type}" not in xpath or self.profile is None:
+                continue
+            total = str(self.count(list_type))
+            if xpath.endswith("[@title]"):
+                return FakeElement(self, "count", total, title=total)
+            return FakeElement(self, "link", f"{total} {list_type}", target=list_type)
+        return None
+
+    def _click(self, element):
+        if element.kind == "link":
+            self.open_dialog(element.target)
+        elif element.kind == "follow":
+            self.confirming = element.target
+        elif element.kind == "confirm":
+            now = self.clock.time()
+            if now < self.blocked_until:
+                self.block_shown = True
+            else:
+                self.followed.discard(self.confirming)
+                self.unfollowed.append(self.confirming)
+                self.unfollowed_at.append(now)
+                if self.block_every and len(self.unfollowed) % self.block_every == 0:
+                    self.blocked_until = now + self.block_for
+                    self.blocks += 1
+            self.confirming = None
+
+    def execute_script(self, script, *args):
+        self._command()
+        if script == NAVIGATE_SCRIPT:
+            self._navigate(args[0])
+            return None
+        self._wait_ready()
+        rows = self.rows()
+        if script == UserCollector.SCRIPT:
+            fresh = rows[self.returned : self.rendered]
+            self.returned = self.rendered
+            return fresh
+        if script == UserCollector.HEIGHT_SCRIPT:
+            return self.rendered * ROW_HEIGHT
+        if script == UserCollector.SCROLL_SCRIPT:
+            self.rendered = min(len(rows), self.rendered + self.batch)
+            return self.rendered * ROW_HEIGHT
+        if script == DialogRows.CLICK_SCRIPT:
+            name = args[1]
+            position = self.positions[self.dialog].get(name) if rows else None
+            if position is None or position >= self.rendered:
+                return None
+            if name in self.followed:
+                self.confirming = name
+                return "Following"
+            return "Follow"
+        if script == ActionCheck.SCRIPT:
+            if self.block_shown:
+                self.block_shown = False
+                return {"blocked": "try again later"}
+            target = args[1] if args[0] is not None else self.profile
+            return {"label": "Following" if target in self.followed else "Follow"}
+        raise WebDriverException("fake driver does not model this script")
+
+    def execute(self, command, params=None):
+        # ActionChains key presses: each PAGE_DOWN/END in the export flow
+        # renders one more batch of rows.
+        self._command()
+        if command == "actions":
+            self.rendered = min(len(self.rows()), self.rendered + self.batch)
+        return {"value": None}
+
+    def execute_async_script(self, script, *args):
+        raise WebDriverException("fake driver does not model async scripts")
+
+    def close(self):
+        # Closes the current tab; like Selenium, the driver has no current
+        # window until it switches to another one.
+        self._command()
+        self.window_handles.remove(self.current_window_handle)
+        self.current_window_handle = None
+
+    def quit(self):
+        self.commands += 1
+        self.closed = True
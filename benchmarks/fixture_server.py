@@ -0,0 +1,350 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import json, re, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CONFIRM_SCRIPT = """
+  function confirmUnfollow(name, button) {{
+    const modal = document.createElement("div");
+    modal.setAttribute("role", "dialog");
+    modal.innerHTML = '<button class="confirm">Unfollow</button>' +
+      '<button class="cancel">Cancel</button>';
+    document.body.appendChild(modal);
+    setTimeout(() => {{
+      modal.querySelector(".confirm").onclick = async () => {{
+        await fetch("/api/v1/friendships/destroy/" + name + "/", {{ method: "POST" }});
+        button.textContent = "Follow";
+        modal.remove();
+      }};
+      modal.querySelector(".cancel").onclick = () => modal.remove();
+    }}, {confirm_delay});
+  }}
+  document.addEventListener("click", (event) => {{
+    const button = event.target.closest("button[data-user]");
+    if (button && button.textContent === "Following") {{
+      confirmUnfollow(button.dataset.user, button);
+    }}
+  }});
+"""
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Login</title></head><body>
+<p>Already logged in.</p>
+<script>setTimeout(() => location.replace("/"), 50);</script>
+</body></html>
+"""
+
+HOME_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Home</title></head><body>
+<p>Fixture home</p>
+</body></html>
+"""
+
+PROFILE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>@{name}</title>{fonts}</head><body>
+<header>
+  <h2>{name}</h2>
+  <a href="/{name}/followers/"><span><span title="{followers}">{followers}</span> followers</span></a>
+  <a href="/{name}/following/"><span><span title="{following}">{following}</span> following</span></a>
+  {button}
+</header>
+<main>{filler}{media}</main>
+<script>{confirm}</script>
+</body></html>
+"""
+
+ROW_SCRIPT = """
+  function addRow(name) {{
+    const row = document.createElement("div");
+    row.className = "row";
+    row.innerHTML = '<a href="/' + name + '/"><span>' + name +
+      '</span></a><button data-user="' + name + '">Following</button>';
+    box.appendChild(row);
+  }}
+"""
+
+DIALOG_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.row {{ height: 54px; display: flex; align-items: center; }}</style>
+</head><body>
+<div role="dialog">
+  <div id="box" style="overflow-y: auto; height: 400px;"></div>
+</div>
+<script>
+  const total = {total}, offset = {offset}, batch = {batch}, delay = {delay};
+  const box = document.getElementById("box");
+  let rendered = 0, pending = false;
+  {rows}
+  function render() {{
+    const end = Math.min(total, rendered + batch);
+    for (let i = rendered; i < end; i++) {{
+      addRow("user_" + String(offset + i).padStart(6, "0"));
+    }}
+    rendered = end;
+    pending = false;
+  }}
+  box.addEventListener("scroll", () => {{
+    if (pending || rendered >= total) return;
+    if (box.scrollTop + box.clientHeight >= box.scrollHeight - 200) {{
+      pending = true;
+      setTimeout(render, delay);
+    }}
+  }});
+  render();
+{confirm}
+</script>
+</body></html>
+"""
+
+NETWORK_DIALOG_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.row {{ height: 54px; display: flex; align-items: center; }}</style>
+</head><body>
+<div role="dialog">
+  <div id="box" style="overflow-y: auto; height: 400px;"></div>
+</div>
+<script>
+  const listType = "{list_type}", total = {total}, offset = {offset};
+  const pageSize = {batch};
+  const box = document.getElementById("box");
+  let nextMaxId = "", loading = false, done = false;
+  {rows}
+  async function loadPage() {{
+    if (loading || done) return;
+    loading = true;
+    let url = "/api/v1/friendships/1/" + listType + "/?count=" + pageSize +
+      "&n=" + total + "&offset=" + offset;
+    if (nextMaxId) url += "&max_id=" + nextMaxId;
+    const page = await (await fetch(url)).json();
+    for (const user of page.users) addRow(user.username);
+    nextMaxId = page.next_max_id || "";
+    done = !nextMaxId;
+    loading = false;
+  }}
+  box.addEventListener("scroll", () => {{
+    if (box.scrollTop + box.clientHeight >= box.scrollHeight - 200) loadPage();
+  }});
+  loadPage();
+{confirm}
+</script>
+</body></html>
+"""
+
+API_ROUTE = re.compile(r"^/api/v1/friendships/[^/]+/(followers|following)/$")
+DESTROY_ROUTE = re.compile(r"^/api/v1/friendships/destroy/([^/]+)/$")
+LIST_ROUTE = re.compile(r"^/([A-Za-z0-9._]+)/(followers|following)/$")
+PROFILE_ROUTE = re.compile(r"^/([A-Za-z0-9._]+)/$")
+MEDIA_ROUTE = re.compile(r"^/media/[^/]+\.(jpg|mp4|woff2)$")
+MEDIA_TYPES = {"jpg": "image/jpeg", "mp4": "video/mp4", "woff2": "font/woff2"}
+
+
+def username(index):
+    return f"user_{index:06d}"
+
+
+def friendship_page(total, count, max_id, offset=0):
+    start = int(max_id or 0)
+    end = min(total, start + count)
+    page = {
+        "users": [
+            {"pk": str(offset + i + 1), "username": username(offset + i)}
+            for i in range(start, end)
+        ],
+        "big_list": end < total,
+        "page_size": count,
+        "status": "ok",
+    }
+    if end < total:
+        page["next_max_id"] = str(end)
+    return page
+
+
+class FixtureServer:
+    # A stand-in for the handful of Instagram pages the tool touches. The
+    # fixture account follows user_000000.. and is followed back by everyone
+    # except the first `non_followers` of them.
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        account="bench",
+        followers=1000,
+        following=1000,
+        non_followers=0,
+        batch=12,
+        delay=0,
+        render="dom",
+        confirm_delay=0,
+        profile_kb=0,
+        media=0,
+        media_kb=64,
+    ):
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+        self.account = account
+        self.counts = {"followers": followers, "following": following}
+        self.offsets = {"followers": non_followers, "following": 0}
+        self.batch = batch
+        self.delay = delay
+        self.render = render
+        self.confirm = CONFIRM_SCRIPT.format(confirm_delay=confirm_delay)
+        self.profile_kb = profile_kb
+        self.media = media
+        self.media_kb = media_kb
+        self.unfollowed = []
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, content_type, body):
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                server.bytes_sent += len(data)
+
+            def do_POST(self):
+                match = DESTROY_ROUTE.match(urlparse(self.path).path)
+                if not match:
+                    self.send_error(404)
+                    return
+                server.unfollowed.append(match.group(1))
+                self._send(200, "application/json", json.dumps({"status": "ok"}))
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                route = server.route(parsed.path, query)
+                if route is None:
+                    self.send_error(404)
+                    return
+                self._send(*route)
+
+        return Handler
+
+    def list_page(self, list_type, total, offset, render=None, batch=None, delay=None):
+        template = (
+            NETWORK_DIALOG_PAGE if (render or self.render) == "network" else DIALOG_PAGE
+        )
+        return template.format(
+            title=list_type,
+            list_type=list_type,
+            total=total,
+            offset=offset,
+            batch=batch or self.batch,
+            delay=self.delay if delay is None else delay,
+            rows=ROW_SCRIPT.format(),
+            confirm=self.confirm,
+        )
+
+    def profile_page(self, name):
+        own = name == self.account
+        filler = "<p>" + "x" * 1024 + "</p>"
+        # Post thumbnails, an autoplaying clip and a web font, each
+        # media_kb in size, like a real profile grid.
+        media = fonts = ""
+        if self.media:
+            media = (
+                "".join(
+                    f'<img src="/media/{name}_{i}.jpg" width="120" height="120">'
+                    for i in range(self.media)
+                )
+                + f'<video src="/media/{name}.mp4" autoplay muted preload="auto"></video>'
+            )
+            fonts = (
+                "<style>@font-face { font-family: f; src: url(/media/font.woff2); }"
+                " body { font-family: f; }</style>"
+            )
+        return PROFILE_PAGE.format(
+            name=name,
+            followers=self.counts["followers"] if own else 0,
+            following=self.counts["following"] if own else 0,
+            button="" if own else f'<button data-user="{name}">Following</button>',
+            filler=filler * self.profile_kb,
+            media=media,
+            fonts=fonts,
+            confirm=self.confirm,
+        )
+
+    def route(self, path, query):
+        html = "text/html; charset=utf-8"
+        if path == "/accounts/login/":
+            return 200, html, LOGIN_PAGE
+        if path == "/":
+            return 200, html, HOME_PAGE
+        if path in ("/dialog", "/netdialog"):
+            return (
+                200,
+                html,
+                self.list_page(
+                    query.get("list", "followers"),
+                    int(query.get("n", 1000)),
+                    int(query.get("offset", 0)),
+                    render="network" if path == "/netdialog" else "dom",
+                    batch=int(query.get("batch", query.get("count", self.batch))),
+                    delay=int(query.get("delay", self.delay)),
+                ),
+            )
+        if API_ROUTE.match(path):
+            page = friendship_page(
+                int(query.get("n", 1000)),
+                int(query.get("count", 12)),
+                query.get("max_id"),
+                int(query.get("offset", 0)),
+            )
+            return 200, "application/json", json.dumps(page)
+        match = MEDIA_ROUTE.match(path)
+        if match:
+            return 200, MEDIA_TYPES[match.group(1)], b"\0" * (self.media_kb * 1024)
+        if path == "/health":
+            return 200, "application/json", json.dumps({"ok": True})
+        match = LIST_ROUTE.match(path)
+        if match and match.group(1) == self.account:
+            list_type = match.group(2)
+            return (
+                200,
+                html,
+                self.list_page(
+                    list_type, self.counts[list_type], self.offsets[list_type]
+                ),
+            )
+        match = PROFILE_ROUTE.match(path)
+        if match:
+            return 200, html, self.profile_page(match.group(1))
+        return None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
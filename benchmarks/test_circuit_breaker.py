@@ -0,0 +1,39 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+from ig_cleaner import CircuitBreaker
+
+
+def test_breaker_retries_then_opens():
+    breaker = CircuitBreaker(failure_limit=3, pause=900)
+    assert not breaker.failure()
+    assert breaker.retry_delay() == 2
+    assert not breaker.failure()
+    assert breaker.retry_delay() == 4
+    assert breaker.failure()
+    assert breaker.open() == 900
+    assert breaker.failures == 0
+    assert breaker.failure(blocked=True)
+
+
+def test_breaker_backs_off_and_stops():
+    breaker = CircuitBreaker(pause=900, max_pause=2000, max_blocks=3)
+    assert [breaker.open() for _ in range(3)] == [900, 1800, 2000]
+    assert not breaker.stopped
+    assert breaker.open() == 0
+    assert breaker.stopped and breaker.blocks == 3
+
+
+def test_success_resets_streak():
+    breaker = CircuitBreaker(pause=60, max_blocks=1)
+    breaker.open()
+    breaker.success()
+    assert breaker.open() == 120
+    assert not breaker.stopped
+    breaker.failure()
+    breaker.success()
+    assert breaker.failures == 0 and breaker.retry_delay() == 1
@@ -0,0 +1,44 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+from ig_cleaner import CountParser
+
+
+def test_exact_titles():
+    assert CountParser.parse("1,234") == 1234
+    assert CountParser.parse("1.234") == 1234
+    assert CountParser.parse("1.234.567") == 1234567
+    assert CountParser.parse("5 followers") == 5
+
+
+def test_space_group_separators():
+    assert CountParser.parse("1 234") == 1234
+    assert CountParser.parse("1 234") == 1234
+    assert CountParser.parse("1 234 followers") == 1234
+    assert CountParser.parse("12 345 678") == 12345678
+
+
+def test_abbreviations():
+    assert CountParser.parse("1.2k") == 1200
+    assert CountParser.parse("1.5M") == 1_500_000
+    assert CountParser.parse("2 M followers") == 2_000_000
+    assert CountParser.parse("12,5 rb") == 12500
+    assert CountParser.parse("12 rb") == 12000
+    assert CountParser.parse("3 jt") == 3_000_000
+
+
+def test_indonesian_m_is_miliar():
+    assert CountParser.parse("1,5 M pengikut") == 1_500_000_000
+    assert CountParser.parse("1,5 M", locale="id") == 1_500_000_000
+    assert CountParser.parse("1,5 M", locale="id-ID") == 1_500_000_000
+    assert CountParser.parse("1.5M", locale="en") == 1_500_000
+
+
+def test_no_number():
+    assert CountParser.parse("") is None
+    assert CountParser.parse(None) is None
+    assert CountParser.parse("followers") is None
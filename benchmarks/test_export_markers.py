@@ -0,0 +1,58 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import os, sqlite3, tempfile
+from ig_cleaner import ExportWriter, SnapshotStore
+
+
+def test_shortfall_margins():
+    # Exact title counts: 2%, but never fewer than 10 users.
+    assert ExportWriter.shortfall(980, 1000, exact=True) is None
+    assert ExportWriter.shortfall(979, 1000, exact=True) == "only 979 of 1000"
+    assert ExportWriter.shortfall(20, 30, exact=True) is None
+    assert ExportWriter.shortfall(19, 30, exact=True) is not None
+    # "12.5K" parses as 12,500 but may be anything from 12,450 up.
+    assert ExportWriter.shortfall(12400, 12500) is None
+    assert ExportWriter.shortfall(6000, 12500) == "only 6000 of about 12500"
+    assert ExportWriter.shortfall(0, None) is None
+    assert ExportWriter.shortfall(5, 0) is None
+
+
+def test_marker_problems():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "me_followers.csv")
+        assert "no completion marker" in ExportWriter.problem(path)
+        ExportWriter.mark_complete(path, 12410, 12500)
+        assert ExportWriter.problem(path) is None
+        ExportWriter.mark_complete(path, 12200, 12500, exact=True)
+        assert ExportWriter.problem(path) == "only 12200 of 12500 rows"
+        marker = ExportWriter.read_marker(path)
+        assert marker["exact"] and marker["rows"] == 12200
+
+
+def test_snapshot_store_migrates_old_tables():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshots.db")
+        db = sqlite3.connect(path)
+        db.execute(
+            "CREATE TABLE snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, account TEXT NOT NULL, "
+            "list_type TEXT NOT NULL, taken_at TEXT NOT NULL, total INTEGER NOT NULL, "
+            "incremental INTEGER NOT NULL DEFAULT 0)"
+        )
+        db.execute(
+            "INSERT INTO snapshots (account, list_type, taken_at, total) "
+            "VALUES ('me', 'followers', '2026-01-01 00:00:00', 3)"
+        )
+        db.commit()
+        db.close()
+        store = SnapshotStore(path)
+        try:
+            store.save("Me", "followers", ["a", "b"], expected=2, exact=True)
+            rows = store.history("me", "followers")
+            assert [row[2:] for row in rows] == [(2, 2, 1), (3, None, None)]
+        finally:
+            store.close()
@@ -0,0 +1,70 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import os, tempfile
+from ig_cleaner import UnfollowJournal
+
+
+def test_resume_after_torn_line():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = UnfollowJournal("Me", directory)
+        journal.plan("all", ["a", "b"], complete=False)
+        journal.extend(["c", "d"])
+        journal.done("a")
+        journal.file.close()
+        # A crash in the middle of a write leaves half a line behind.
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"op": "done", "us')
+
+        journal = UnfollowJournal("me", directory)
+        assert journal.pending("all") == ["b", "c", "d"]
+        assert journal.pending("nonfollowers") == []
+        assert not journal.complete
+        journal.done("b")
+        journal.file.close()
+
+        journal = UnfollowJournal("me", directory)
+        assert journal.remaining() == ["c", "d"]
+        journal.file.close()
+
+
+def test_failures_and_skips():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = UnfollowJournal("me", directory)
+        journal.plan("nonfollowers", ["a", "b", "c"])
+        for _ in range(UnfollowJournal.MAX_ATTEMPTS - 1):
+            journal.failed("a", "button did not change")
+        journal.skip("b", "page not found")
+        assert journal.remaining() == ["a", "c"]
+        journal.file.close()
+
+        journal = UnfollowJournal("me", directory)
+        assert journal.remaining() == ["a", "c"]
+        journal.failed("a", "button did not change")
+        assert journal.remaining() == ["c"]
+        journal.file.close()
+
+
+def test_close_ends_finished_plan_only():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = UnfollowJournal("me", directory)
+        journal.plan("all", ["a"], complete=False)
+        journal.done("a")
+        journal.close()
+        # The plan was still streaming, so it stays open for a resume.
+        journal = UnfollowJournal("me", directory)
+        assert journal.open
+        journal.mark_complete()
+        journal.close()
+
+        journal = UnfollowJournal("me", directory)
+        assert not journal.open and journal.pending("all") == []
+        journal.plan("all", ["x"])
+        journal.close()
+        with open(journal.path, encoding="utf-8") as f:
+            assert f.read().count('"op": "plan"') == 1
+        assert os.path.basename(journal.path) == "me.jsonl"
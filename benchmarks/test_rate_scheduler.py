@@ -0,0 +1,47 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import tempfile
+from fake_driver import VirtualClock
+from ig_cleaner import RateScheduler, TokenBucket
+
+
+def test_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(60, 3600, tokens=0, updated=1000)
+    assert bucket.wait_time() == 60
+    bucket.refill(1030)
+    assert abs(bucket.tokens - 0.5) < 1e-9
+    assert abs(bucket.wait_time() - 30) < 1e-9
+    bucket.refill(1000)  # a clock that went backwards adds nothing
+    assert abs(bucket.tokens - 0.5) < 1e-9
+    bucket.refill(10**6)
+    assert bucket.tokens == 60 and bucket.wait_time() == 0
+    assert TokenBucket(5, 3600, tokens=99, updated=0).tokens == 5
+
+
+def test_scheduler_persists_and_refunds():
+    clock = VirtualClock(start=0)
+    with tempfile.TemporaryDirectory() as directory:
+        limits = {"hourly": 2, "daily": 10}
+        scheduler = RateScheduler("me", limits, directory, clock)
+        scheduler.take()
+        scheduler.take()
+        assert scheduler.available() == 0
+        assert scheduler.wait_time() == 1800
+        scheduler.refund()
+        assert scheduler.available() == 1
+
+        # A restart keeps the spent budget; a changed limit resets it.
+        again = RateScheduler("ME", limits, directory, clock)
+        assert again.available() == 1
+        assert again.buckets["daily"].tokens == 9
+        changed = RateScheduler("me", {"hourly": 3, "daily": 10}, directory, clock)
+        assert changed.buckets["hourly"].tokens == 3
+
+        unlimited = RateScheduler("me", {"hourly": 0, "daily": None}, directory, clock)
+        unlimited.take()
+        assert unlimited.wait_time() == 0 and unlimited.available() == -1
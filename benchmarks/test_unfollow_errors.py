@@ -0,0 +1,95 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+import builtins, json, logging, os, tempfile
+from common import ScriptedConsole
+from fake_driver import FakeDriver, VirtualClock
+from fixture_server import username
+from selenium.common.exceptions import WebDriverException
+import ig_cleaner
+
+ACCOUNT = "errors"
+
+
+def run_non_followers(settings, **driver_options):
+    # 30 of 60 followings do not follow back. Returns the flow's result (or
+    # the exception it raised), the driver, the journal entries and what a
+    # resumed run would still unfollow.
+    users = [username(i) for i in range(60)]
+    clock = VirtualClock()
+    driver = FakeDriver(ACCOUNT, users[30:], users, clock=clock, **driver_options)
+    menu = ig_cleaner.MainMenu(
+        ScriptedConsole([ACCOUNT]),
+        logging.getLogger("test"),
+        None,
+        None,
+        None,
+        None,
+        clock=clock,
+        driver_factory=lambda: driver,
+    )
+    cwd = os.getcwd()
+    saved_input = builtins.input
+    builtins.input = lambda prompt="": "y"
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            with open("settings.json", "w") as f:
+                json.dump(dict({"PREFETCH_PROFILES": False}, **settings), f)
+            try:
+                result = menu.unfollow_non_followers()
+            except Exception as e:
+                result = e
+            journal = ig_cleaner.UnfollowJournal(ACCOUNT)
+            pending = journal.pending("non_followers")
+            journal.file.close()
+            with open(journal.path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+        finally:
+            os.chdir(cwd)
+            builtins.input = saved_input
+    return result, driver, entries, pending
+
+
+def test_lost_session_keeps_the_rest_of_the_journal():
+    for in_dialog, prefetch in [(True, False), (False, False), (False, True)]:
+        result, driver, entries, pending = run_non_followers(
+            {"UNFOLLOW_IN_DIALOG": in_dialog, "PREFETCH_PROFILES": prefetch},
+            crash_after=5,
+        )
+        assert isinstance(result, WebDriverException), result
+        assert len(driver.unfollowed) == 5
+        # The browser died while the fifth unfollow was being verified, so
+        # that user stays pending too; a resumed run finds it "already" done.
+        ops = [entry["op"] for entry in entries]
+        assert ops.count("done") == 4
+        assert "skip" not in ops and "fail" not in ops and "end" not in ops
+        assert len(pending) == 26 and pending[0] == driver.unfollowed[-1]
+
+
+def test_page_errors_are_retried_then_given_up():
+    broken = {username(3), username(7)}
+    result, driver, entries, pending = run_non_followers(
+        {"UNFOLLOW_IN_DIALOG": False}, unreachable=broken
+    )
+    assert result is True
+    assert len(driver.unfollowed) == 28
+    fails = [entry["user"] for entry in entries if entry["op"] == "fail"]
+    assert sorted(fails) == sorted(
+        list(broken) * ig_cleaner.UnfollowJournal.MAX_ATTEMPTS
+    )
+    assert not any(entry["op"] == "skip" for entry in entries)
+    assert pending == []
+
+
+def test_session_errors():
+    lost = ig_cleaner.MainMenu.session_lost
+    assert lost(WebDriverException("invalid session id"))
+    assert lost(WebDriverException("no such window: target window already closed"))
+    assert lost(ConnectionRefusedError())
+    assert not lost(WebDriverException("unknown error: net::ERR_CONNECTION_RESET"))
+    assert not lost(ValueError("invalid session id"))
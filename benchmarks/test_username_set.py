@@ -0,0 +1,64 @@
+#  GITHUB: https://github.com/denoyey/IG-Cleaner
+
+# -*- coding: utf-8 -*-
+# This file is part of IG-Cleaner.
+# It is released under the MIT License.
+# See the LICENSE file for more details.
+
+from ig_cleaner import UsernameSet
+
+
+def test_dedupe_keeps_first_order():
+    names = UsernameSet(["b", "a", "b", "c", "a"])
+    assert list(names) == ["b", "a", "c"]
+    assert len(names) == 3
+    assert not names.add("a")
+    assert names.add("d")
+    assert "d" in names and "e" not in names
+
+
+def test_unicode_and_long_names():
+    names = UsernameSet(["zoë", "ユーザー"])
+    assert list(names) == ["zoë", "ユーザー"]
+    try:
+        names.add("x" * 256)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("names over 255 bytes must be rejected")
+
+
+def test_grows_past_initial_table():
+    users = [f"user_{i}" for i in range(5000)]
+    names = UsernameSet(users + users[::7])
+    assert len(names) == len(users)
+    assert list(names) == users
+    assert all(user in names for user in users[::97])
+
+
+def test_difference():
+    following = UsernameSet(["a", "b", "c", "d"])
+    followers = UsernameSet(["b", "d", "x"])
+    assert list(following.difference(followers)) == ["a", "c"]
+    assert list(following.difference({"a"})) == ["b", "c", "d"]
+
+
+def test_spill_to_file():
+    users = [f"user_{i}" for i in range(2000)]
+    names = UsernameSet(spill_bytes=1024)
+    names.update(users[:1000])
+    assert names.file is not None
+    names.update(users)
+    assert len(names) == len(users)
+    assert list(names) == users
+    assert "user_1999" in names and "user_2000" not in names
+    names.close()
+    assert len(names) == 0 and list(names) == []
+
+
+def test_position_and_iter_from():
+    names = UsernameSet(["a", "bb", "ccc"])
+    assert names.position("missing") == -1
+    assert list(names.iter_from(names.position("a"))) == ["a", "bb", "ccc"]
+    assert list(names.iter_from(names.position("bb"))) == ["bb", "ccc"]
+    assert list(names.iter_from(names.position("ccc"))) == ["ccc"]
@@ -5,21 +5,119 @@
 # It is released under the MIT License.
 # See the LICENSE file for more details.
 
-import os, sys, platform, subprocess, logging, random, itertools, time, math, json, pandas as pd, re
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
+import os, sys, argparse, platform, subprocess, logging, logging.handlers, queue, gzip, random, itertools, time, math, json, re, base64, sqlite3, shutil, signal, urllib.request, concurrent.futures, multiprocessing, contextlib, threading, heapq, tempfile, array, mmap, hashlib, importlib, importlib.util
 from datetime import datetime
 from rich.text import Text
 from rich.console import Console
 
 
+class LazyImport:
+    # Placeholder for a heavy module-level name. The first attribute access
+    # or call runs the loader, which swaps the real objects into globals().
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def _resolve(self):
+        return self._loader()[self._name]
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+
+def load_selenium():
+    from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support import expected_conditions as EC
+
+    names = {
+        "webdriver": webdriver,
+        "TimeoutException": TimeoutException,
+        "WebDriverException": WebDriverException,
+        "By": By,
+        "Options": Options,
+        "Service": Service,
+        "WebDriverWait": WebDriverWait,
+        "Keys": Keys,
+        "ActionChains": ActionChains,
+        "EC": EC,
+    }
+    globals().update(names)
+    return names
+
+
+def load_pandas():
+    import pandas as pd
+
+    globals()["pd"] = pd
+    return {"pd": pd}
+
+
+# selenium and pandas take seconds to import; the menu does not need them.
+# `except TimeoutException` only runs once selenium code has raised, by
+# which time the real class is in place (new_driver loads it up front).
+webdriver = LazyImport(load_selenium, "webdriver")
+TimeoutException = LazyImport(load_selenium, "TimeoutException")
+WebDriverException = LazyImport(load_selenium, "WebDriverException")
+By = LazyImport(load_selenium, "By")
+Options = LazyImport(load_selenium, "Options")
+Service = LazyImport(load_selenium, "Service")
+WebDriverWait = LazyImport(load_selenium, "WebDriverWait")
+Keys = LazyImport(load_selenium, "Keys")
+ActionChains = LazyImport(load_selenium, "ActionChains")
+EC = LazyImport(load_selenium, "EC")
+pd = LazyImport(load_pandas, "pd")
+
+IG_BASE_URL = os.environ.get("IG_CLEANER_BASE_URL", "https://www.instagram.com")
+DEFAULT_SETTINGS = {
+    "MAX_SAFE_LIMIT": 150,
+    "BATCH_DELAY": 20,
+    "SLEEP_BETWEEN": [2, 5],
+    "SLEEP_AFTER_BATCH": 60,
+    "COLLECT_MODE": "dom",
+    "OBSERVER_TIMEOUT": 4,
+    "INCREMENTAL_SCAN": False,
+    "INCREMENTAL_STOP_RUN": 50,
+    "UNFOLLOW_IN_DIALOG": True,
+    "BROWSER_DAEMON": False,
+    "DAEMON_PORT": 9222,
+    "CHROME_BINARY": "",
+    "PARALLEL_SCANS": 1,
+    "HOURLY_LIMIT": 60,
+    "DAILY_LIMIT": 200,
+    "RATE_MAX_WAIT": 900,
+    "METRICS": True,
+    "STREAM_EXPORT": True,
+    "EXPORT_FLUSH_EVERY": 500,
+    "EXPORT_SORT": True,
+    "SET_SPILL_MB": 64,
+    "STALL_LIMIT": 3,
+    "FAILURE_LIMIT": 3,
+    "BLOCK_PAUSE": 900,
+    "BLOCK_PAUSE_MAX": 14400,
+    "MAX_BLOCKS": 3,
+    "LEAN_BROWSER": False,
+    "HEADLESS_AFTER_LOGIN": False,
+    "DISK_CACHE_MB": 0,
+    "PREFETCH_PROFILES": True,
+    "DASHBOARD_REFRESH": 4,
+    "CHROME_PROFILE_DIR": "chrome_profile_ig_cleaner",
+    "MAX_BROWSERS": 2,
+}
+SETTING_CHOICES = {
+    "COLLECT_MODE": ["dom", "observer", "network"],
+}
+
+
 class LogoPrinter:
     def __init__(self, console: Console):
         self.console = console
@@ -51,63 +149,135 @@ class LogoPrinter:
 
 
 class LoggerManager:
-    class DayChangeHandler(logging.FileHandler):
-        def __init__(self, filename, encoding=None):
-            super().__init__(filename, encoding=encoding)
+    # Records are handed to a queue and written by a listener thread, so the
+    # scroll and unfollow loops never wait on the disk. The file rolls over
+    # when it passes max_kb or the day changes; the old file is gzipped into
+    # log/archive/ and the newest `keep` archives are kept.
+    listener = None
+    file_handler = None
+
+    class DayChangeHandler(logging.handlers.BaseRotatingHandler):
+        def __init__(self, filename, encoding=None, max_bytes=0, keep=30):
+            super().__init__(filename, "a", encoding=encoding)
+            self.max_bytes = max_bytes
+            self.keep = keep
+            self.archive_dir = os.path.join(os.path.dirname(filename), "archive")
+            self.rotator = self._compress
             self.last_date = self._get_last_log_date(filename)
 
-        def _get_last_log_date(self, filename):
-            if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                with open(filename, encoding="utf-8") as f:
-                    for line in reversed(f.readlines()):
-                        try:
-                            date_str = line.split(" - ")[0]
-                            return datetime.strptime(
-                                date_str, "%Y-%m-%d %H:%M:%S"
-                            ).date()
-                        except:
-                            continue
+        def _get_last_log_date(self, filename, tail=64 * 1024):
+            # Only the end of the file is read, however large it is.
+            if not os.path.exists(filename) or not os.path.getsize(filename):
+                return None
+            with open(filename, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - tail))
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+            for line in reversed(lines):
+                try:
+                    date_str = line.split(" - ")[0]
+                    return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S").date()
+                except:
+                    continue
             return None
 
-        def emit(self, record):
+        def shouldRollover(self, record):
             current_date = datetime.fromtimestamp(record.created).date()
-            if self.last_date and self.last_date != current_date and self.stream:
-                self.stream.write("\n\n")
-            self.last_date = current_date
+            if self.last_date and self.last_date != current_date:
+                return True
+            if self.stream is None:
+                self.stream = self._open()
+            return self.max_bytes > 0 and self.stream.tell() >= self.max_bytes
+
+        def doRollover(self):
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+                os.makedirs(self.archive_dir, exist_ok=True)
+                name = os.path.splitext(os.path.basename(self.baseFilename))[0]
+                day = (self.last_date or datetime.now().date()).strftime("%Y-%m-%d")
+                archives = self._archives(name)
+                part = 1 + max([p for d, p, _ in archives if d == day] or [0])
+                suffix = f"_{part}" if part > 1 else ""
+                self.rotate(
+                    self.baseFilename,
+                    os.path.join(self.archive_dir, f"{name}_{day}{suffix}.log.gz"),
+                )
+                self._prune(name)
+            self.stream = self._open()
+
+        def _compress(self, source, dest):
+            with open(source, "rb") as src, gzip.open(dest, "wb") as out:
+                shutil.copyfileobj(src, out)
+            os.remove(source)
+
+        def _archives(self, name):
+            # (day, part, filename), oldest first.
+            pattern = re.compile(
+                re.escape(name) + r"_(\d{4}-\d{2}-\d{2})(?:_(\d+))?\.log\.gz$"
+            )
+            archives = []
+            for f in os.listdir(self.archive_dir):
+                match = pattern.match(f)
+                if match:
+                    archives.append((match.group(1), int(match.group(2) or 1), f))
+            return sorted(archives)
+
+        def _prune(self, name):
+            archives = self._archives(name)
+            for _, _, f in archives[: max(0, len(archives) - self.keep)]:
+                os.remove(os.path.join(self.archive_dir, f))
+
+        def emit(self, record):
             super().emit(record)
+            self.last_date = datetime.fromtimestamp(record.created).date()
 
-    def __init__(self, log_file="logfile.log"):
+    def __init__(self, log_file="ig_cleaner.log", max_kb=500, keep=30):
         self.log_dir = "log"
-        self._ensure_log_dir()
         self.log_file = os.path.join(self.log_dir, log_file)
+        self._ensure_log_dir()
+        self.max_kb = max_kb
+        self.keep = keep
         self.logger = self._setup_logger()
 
     def _ensure_log_dir(self):
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
 
     def _setup_logger(self):
         logger = logging.getLogger("core_logger")
         logger.setLevel(logging.INFO)
         if not logger.handlers:
-            handler = self.DayChangeHandler(self.log_file, encoding="utf-8")
+            handler = self.DayChangeHandler(
+                self.log_file,
+                encoding="utf-8",
+                max_bytes=self.max_kb * 1024,
+                keep=self.keep,
+            )
             handler.setFormatter(
                 logging.Formatter(
                     "%(asctime)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"
                 )
             )
-            logger.addHandler(handler)
+            log_queue = queue.SimpleQueue()
+            LoggerManager.file_handler = handler
+            LoggerManager.listener = logging.handlers.QueueListener(log_queue, handler)
+            LoggerManager.listener.start()
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
         return logger
 
-    def cleanup(self, max_kb=500):
-        if (
-            os.path.exists(self.log_file)
-            and os.path.getsize(self.log_file) > max_kb * 1024
-        ):
-            for h in logging.root.handlers[:]:
-                logging.root.removeHandler(h)
-                h.close()
-            open(self.log_file, "w", encoding="utf-8").close()
+    def cleanup(self):
+        # Drains the queue, then detaches and closes core_logger's handlers.
+        logger = logging.getLogger("core_logger")
+        if LoggerManager.listener:
+            LoggerManager.listener.stop()
+            LoggerManager.listener = None
+        for h in logger.handlers[:]:
+            logger.removeHandler(h)
+            h.close()
+        if LoggerManager.file_handler:
+            LoggerManager.file_handler.close()
+            LoggerManager.file_handler = None
 
 
 class ConsoleHelper:
@@ -129,59 +299,1946 @@ class ConsoleHelper:
             self.print("[red]\n\n[!] Input aborted or unavailable. Exiting...[/red]")
             exit()
 
-    def print(self, msg, style=None):
-        self.console.print(f"[{style}]{msg}[/{style}]" if style else msg)
+    def print(self, msg, style=None):
+        self.console.print(f"[{style}]{msg}[/{style}]" if style else msg)
+
+
+class CommandRunner:
+    def __init__(self, console, logger):
+        self.console, self.logger = console, logger
+        self.is_windows = platform.system() == "Windows"
+
+    def clear_screen(self):
+        subprocess.run("cls" if self.is_windows else "clear", shell=True)
+
+    def run(self, cmd, success="", fail=""):
+        try:
+            subprocess.check_call(cmd)
+            if success:
+                self.console.print(success, "green")
+        except subprocess.CalledProcessError as e:
+            if fail:
+                self.console.print(f"{fail} {e}", "red")
+            self.logger.error(f"{fail} {e}")
+            sys.exit(1)
+
+
+class DependencyInstaller:
+    # Packages are located with find_spec, which does not import them. The
+    # fingerprint only uses inputs that cost a stat each: the interpreter,
+    # the package list and the mtime of every site-packages directory, which
+    # changes whenever pip adds or removes a package there. While it matches
+    # the one cached in .meta/, no package is probed at all.
+    CACHE_FILE = os.path.join(".meta", "deps.json")
+    LEGACY_FLAG = os.path.join(".meta", "deps_checked.flag")
+
+    def __init__(self, console, logger, packages=None):
+        self.console, self.logger, self.packages = console, logger, packages or []
+
+    def locate(self, pkg):
+        try:
+            spec = importlib.util.find_spec(pkg)
+        except (ImportError, ValueError):
+            return None
+        return spec.origin if spec else None
+
+    def missing(self):
+        return [pkg for pkg in self.packages if self.locate(pkg) is None]
+
+    def fingerprint(self):
+        parts = [sys.executable, sys.version, ",".join(self.packages)]
+        for path in sys.path:
+            if os.path.basename(path) not in ("site-packages", "dist-packages"):
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                mtime = None
+            parts.append(f"{path}@{mtime}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def record(self):
+        os.makedirs(os.path.dirname(self.CACHE_FILE), exist_ok=True)
+        with open(self.CACHE_FILE, "w") as f:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint(),
+                    "packages": self.packages,
+                    "checked_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                },
+                f,
+                indent=4,
+            )
+        if os.path.exists(self.LEGACY_FLAG):
+            os.remove(self.LEGACY_FLAG)
+
+    def ready(self):
+        try:
+            with open(self.CACHE_FILE, "r") as f:
+                cached = json.load(f).get("fingerprint")
+        except (OSError, ValueError):
+            cached = None
+        if cached and cached == self.fingerprint():
+            return True
+        if self.missing():
+            return False
+        self.record()
+        return True
+
+    def check_and_install(self):
+        self.console.print("\n>> Checking Python packages...", "cyan")
+        missing = self.missing()
+        for pkg in self.packages:
+            if pkg not in missing:
+                self.console.print(f"[✓] {pkg} already installed.", "green")
+                continue
+            self.console.print(f"[✓] {pkg} missing. Installing...", "yellow")
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+                self.console.print(f"[✓] {pkg} installed.", "green")
+            except subprocess.CalledProcessError:
+                self.console.print(f"Failed to install {pkg}", "red")
+                self.logger.error(f"Could not install {pkg}")
+                sys.exit(1)
+        importlib.invalidate_caches()
+        self.record()
+
+
+class BrowserDaemon:
+    STATE_FILE = os.path.join(".meta", "browser.json")
+    BINARIES = [
+        "google-chrome",
+        "google-chrome-stable",
+        "chromium",
+        "chromium-browser",
+        "chrome",
+    ]
+    WINDOWS_PATHS = [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    ]
+
+    def __init__(self, user_data_dir, port=9222, binary="", logger=None, args=()):
+        self.user_data_dir = user_data_dir
+        self.port = int(port)
+        self.binary = binary
+        self.logger = logger
+        self.args = list(args)
+
+    @property
+    def address(self):
+        return f"127.0.0.1:{self.port}"
+
+    def find_binary(self):
+        if self.binary:
+            return self.binary
+        for name in self.BINARIES:
+            path = shutil.which(name)
+            if path:
+                return path
+        for path in self.WINDOWS_PATHS:
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(
+            "Chrome binary not found. Set CHROME_BINARY in settings."
+        )
+
+    def read_state(self):
+        try:
+            with open(self.STATE_FILE, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def version(self, port=None, timeout=1):
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port or self.port}/json/version", timeout=timeout
+            ) as response:
+                return json.load(response) if response.status == 200 else None
+        except Exception:
+            return None
+
+    def healthy(self, timeout=1):
+        return self.version(timeout=timeout) is not None
+
+    def write_state(self, state):
+        os.makedirs(os.path.dirname(self.STATE_FILE), exist_ok=True)
+        with open(self.STATE_FILE, "w") as f:
+            json.dump(state, f, indent=4)
+
+    @staticmethod
+    def command_line(pid):
+        try:
+            if platform.system() == "Linux":
+                with open(f"/proc/{int(pid)}/cmdline", "rb") as f:
+                    return f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+            if platform.system() == "Windows":
+                cmd = [
+                    "powershell",
+                    "-NoProfile",
+                    "-Command",
+                    f"(Get-CimInstance Win32_Process -Filter 'ProcessId={int(pid)}').CommandLine",
+                ]
+            else:
+                cmd = ["ps", "-p", str(int(pid)), "-o", "command="]
+            return subprocess.run(
+                cmd, capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return ""
+
+    def owns(self, state):
+        # After a reboot the recorded pid can belong to any process. It is
+        # only ours if the debug port still answers as the browser we
+        # launched, or the process runs with our profile directory.
+        version = self.version(state.get("port"))
+        if version and state.get("browser"):
+            return version.get("webSocketDebuggerUrl") == state["browser"]
+        user_data_dir = state.get("user_data_dir")
+        return bool(user_data_dir) and (
+            f"--user-data-dir={user_data_dir}" in self.command_line(state["pid"])
+        )
+
+    def launch(self, wait=20):
+        self.stop()
+        cmd = [
+            self.find_binary(),
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.user_data_dir}",
+            "--start-maximized",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ] + self.args
+        kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if platform.system() == "Windows":
+            kwargs["creationflags"] = 0x00000008 | 0x00000200
+        else:
+            kwargs["start_new_session"] = True
+        process = subprocess.Popen(cmd, **kwargs)
+        state = {
+            "pid": process.pid,
+            "port": self.port,
+            "user_data_dir": self.user_data_dir,
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.write_state(state)
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            version = self.version()
+            if version:
+                state["browser"] = version.get("webSocketDebuggerUrl")
+                self.write_state(state)
+                if self.logger:
+                    self.logger.info(f"Browser daemon started (pid {process.pid})")
+                return self.address
+            if process.poll() is not None:
+                break
+            time.sleep(0.25)
+        raise RuntimeError(f"Browser daemon did not come up on {self.address}")
+
+    def ensure(self):
+        if self.healthy():
+            return self.address
+        if self.logger:
+            self.logger.warning("Browser daemon not responding, relaunching")
+        return self.launch()
+
+    def stop(self):
+        state = self.read_state()
+        pid = state.get("pid")
+        if pid and not self.owns(state):
+            if self.logger:
+                self.logger.info(
+                    f"Browser state is stale (pid {pid} is not the daemon), removing it"
+                )
+        elif pid:
+            try:
+                if platform.system() == "Windows":
+                    subprocess.run(
+                        ["taskkill", "/PID", str(pid), "/T", "/F"],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                else:
+                    os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        if os.path.exists(self.STATE_FILE):
+            os.remove(self.STATE_FILE)
+
+
+class LeanBrowser:
+    # Cuts what Chrome downloads on every profile visit. Images are switched
+    # off in the profile's content settings, and images, video and web fonts
+    # are also refused at the network layer over CDP. With headless, a
+    # profile that already holds a live Instagram session starts windowless.
+    BLOCKED_URLS = [
+        "*.jpg*",
+        "*.jpeg*",
+        "*.png*",
+        "*.gif*",
+        "*.webp*",
+        "*.heic*",
+        "*.avif*",
+        "*.mp4*",
+        "*.m4v*",
+        "*.webm*",
+        "*.m4s*",
+        "*.woff*",
+        "*.ttf*",
+        "*.otf*",
+        "*://scontent*.cdninstagram.com/*",
+        "*://*.fbcdn.net/*",
+    ]
+    COOKIE_FILES = [
+        os.path.join("Default", "Network", "Cookies"),
+        os.path.join("Default", "Cookies"),
+    ]
+
+    def __init__(self, user_data_dir, cache_mb=0, headless=False):
+        self.user_data_dir = user_data_dir
+        self.cache_mb = cache_mb
+        self.headless = headless
+
+    def arguments(self):
+        args = [
+            "--blink-settings=imagesEnabled=false",
+            "--autoplay-policy=user-gesture-required",
+            "--mute-audio",
+        ]
+        if self.cache_mb and self.cache_mb > 0:
+            args.append(f"--disk-cache-size={int(self.cache_mb * 1024 * 1024)}")
+        return args
+
+    def configure(self, options):
+        # Returns True when the browser will start headless.
+        for arg in self.arguments():
+            options.add_argument(arg)
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        if self.headless and self.logged_in():
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1280,900")
+            return True
+        return False
+
+    def attach(self, driver, network_enabled=False):
+        if not network_enabled:
+            driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URLS})
+
+    def logged_in(self):
+        # Chrome stores cookie expiry in microseconds since 1601.
+        now = (time.time() + 11644473600) * 1000000
+        for name in self.COOKIE_FILES:
+            path = os.path.join(self.user_data_dir, name)
+            if not os.path.exists(path):
+                continue
+            try:
+                uri = f"file:{urllib.request.pathname2url(path)}?mode=ro&immutable=1"
+                with contextlib.closing(sqlite3.connect(uri, uri=True)) as db:
+                    row = db.execute(
+                        "SELECT MAX(expires_utc) FROM cookies "
+                        "WHERE name = 'sessionid' AND host_key LIKE '%instagram.com'"
+                    ).fetchone()
+            except sqlite3.Error:
+                continue
+            if row and row[0] and row[0] > now:
+                return True
+        return False
+
+
+class Clock:
+    # Time, sleeps and random jitter behind one object, so the unfollow loops
+    # can run against a virtual clock (see benchmarks/fake_driver.py).
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def uniform(self, low, high):
+        return random.uniform(low, high)
+
+
+class CountParser:
+    # Follower/following counts as Instagram renders them in English and
+    # Indonesian: exact titles ("1,234" / "1.234" / "1 234") and
+    # abbreviations ("1.2k", "12,5 rb", "3 jt", "1.5M"). "M" is million in
+    # English but miliar (10^9) in Indonesian, so suffixes are per locale.
+    SUFFIXES = {
+        "en": {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000},
+        "id": {
+            "rb": 1_000,
+            "ribu": 1_000,
+            "jt": 1_000_000,
+            "juta": 1_000_000,
+            "m": 1_000_000_000,
+            "miliar": 1_000_000_000,
+        },
+    }
+    # Space separated groups count only when exactly three digits follow,
+    # so "12 rb" keeps its suffix and "1 234" stays one number.
+    PATTERN = re.compile(
+        r"(\d(?:[\d.,]|\s(?=\d{3}(?!\d)))*)\s*(ribu|rb|k|juta|jt|miliar|m|b)?(?![a-z])",
+        re.IGNORECASE,
+    )
+    INDONESIAN = re.compile(
+        r"\b(pengikut|mengikuti|ribu|rb|juta|jt|miliar)\b", re.IGNORECASE
+    )
+
+    @classmethod
+    def locale(cls, text):
+        return "id" if cls.INDONESIAN.search(text or "") else "en"
+
+    @classmethod
+    def parse(cls, text, locale=None):
+        if not text:
+            return None
+        text = text.replace("\u00a0", " ").replace("\u202f", " ")
+        match = cls.PATTERN.search(text)
+        if not match:
+            return None
+        number = re.sub(r"\s", "", match.group(1)).rstrip(".,")
+        suffix = (match.group(2) or "").lower()
+        if not suffix:
+            # Without an abbreviation every separator groups thousands.
+            return int(re.sub(r"[.,]", "", number))
+        suffixes = cls.SUFFIXES.get((locale or cls.locale(text))[:2].lower())
+        multiplier = (suffixes or cls.SUFFIXES["en"]).get(suffix)
+        if multiplier is None:
+            multiplier = next(
+                table[suffix] for table in cls.SUFFIXES.values() if suffix in table
+            )
+        # With one, the last separator is the decimal point (1.2k, 12,5 rb).
+        *whole, last = re.split(r"[.,]", number)
+        value = float(f"{''.join(whole)}.{last}" if whole else last)
+        return int(round(value * multiplier))
+
+
+class UsernameSet:
+    # Insertion-ordered set of usernames stored as length-prefixed UTF-8 in
+    # one buffer, indexed by an open-addressing table of 4-byte offsets:
+    # roughly 20 bytes per user instead of ~80 for a set of str. Past
+    # spill_bytes the buffer moves to a memory-mapped temp file.
+    def __init__(self, names=(), spill_bytes=64 * 1024 * 1024):
+        self.spill_bytes = spill_bytes
+        self.data = bytearray()
+        self.size = 0
+        self.count = 0
+        self.slots = array.array("I", [0]) * 1024
+        self.mask = len(self.slots) - 1
+        self.file = None
+        self.update(names)
+
+    def _key(self, offset):
+        return bytes(self.data[offset : offset + self.data[offset - 1]])
+
+    def _find(self, key):
+        i = hash(key) & self.mask
+        while True:
+            offset = self.slots[i]
+            if not offset or self._key(offset) == key:
+                return i, bool(offset)
+            i = (i + 1) & self.mask
+
+    def _grow(self):
+        old = self.slots
+        self.slots = array.array("I", [0]) * (len(old) * 2)
+        self.mask = len(self.slots) - 1
+        for offset in old:
+            if offset:
+                i = hash(self._key(offset)) & self.mask
+                while self.slots[i]:
+                    i = (i + 1) & self.mask
+                self.slots[i] = offset
+
+    def _append(self, entry):
+        end = self.size + len(entry)
+        if self.file is None:
+            self.data += entry
+            self.size = end
+            if self.size > self.spill_bytes:
+                self._spill()
+            return
+        if end > len(self.data):
+            self._remap(max(end, len(self.data) * 2))
+        self.data[self.size : end] = entry
+        self.size = end
+
+    def _spill(self):
+        self.file = tempfile.TemporaryFile()
+        self.file.write(self.data)
+        self.file.flush()
+        self._remap(max(self.size * 2, 1024 * 1024))
+
+    def _remap(self, capacity):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.truncate(capacity)
+        self.data = mmap.mmap(self.file.fileno(), capacity)
+
+    def add(self, name):
+        key = name.encode("utf-8")
+        if len(key) > 255:
+            raise ValueError(f"Username too long: {name[:40]}...")
+        slot, found = self._find(key)
+        if found:
+            return False
+        self._append(bytes([len(key)]) + key)
+        self.slots[slot] = self.size - len(key)
+        self.count += 1
+        if self.count * 10 > len(self.slots) * 7:
+            self._grow()
+        return True
+
+    def update(self, names):
+        for name in names:
+            self.add(name)
+
+    def position(self, name):
+        slot, found = self._find(name.encode("utf-8"))
+        return self.slots[slot] - 1 if found else -1
+
+    def iter_from(self, position=0):
+        while position < self.size:
+            length = self.data[position]
+            yield bytes(self.data[position + 1 : position + 1 + length]).decode("utf-8")
+            position += 1 + length
+
+    def difference(self, other):
+        return (name for name in self if name not in other)
+
+    def __contains__(self, name):
+        return self._find(name.encode("utf-8"))[1]
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.file is not None:
+            self.data.close()
+            self.file.close()
+            self.file = None
+        self.data = bytearray()
+        self.size = 0
+        self.count = 0
+        self.slots = array.array("I", [0]) * 1024
+        self.mask = len(self.slots) - 1
+
+
+class UserCollector:
+    # One execute_script round trip per pass; the page remembers what it
+    # already returned, so only new usernames cross the wire.
+    RESERVED_PATHS = ["explore", "reels", "direct", "accounts", "stories", "p"]
+    SCRIPT = r"""
+        const box = arguments[0], reserved = new Set(arguments[1]);
+        const seen = box.__igcSeen || (box.__igcSeen = new Set());
+        const fresh = [];
+        for (const a of box.querySelectorAll("a[href]")) {
+            let url;
+            try { url = new URL(a.getAttribute("href"), location.href); }
+            catch (e) { continue; }
+            if (url.origin !== location.origin) continue;
+            const parts = url.pathname.split("/").filter(Boolean);
+            if (parts.length !== 1 || reserved.has(parts[0])) continue;
+            if (seen.has(parts[0])) continue;
+            seen.add(parts[0]);
+            fresh.push(parts[0]);
+        }
+        return fresh;
+    """
+
+    SCROLL_SCRIPT = "arguments[0].scrollTo(0, arguments[0].scrollHeight); return arguments[0].scrollHeight;"
+    HEIGHT_SCRIPT = "return arguments[0].scrollHeight;"
+
+    def __init__(self, driver, scroll_box, wait_time=1, clock=None, stall_limit=3):
+        self.driver = driver
+        self.scroll_box = scroll_box
+        self.wait_time = wait_time
+        self.clock = clock or Clock()
+        self.metrics = RunMetrics()
+        self.stall_limit = max(1, stall_limit)
+        self.stalls = 0
+        self.calls = 0
+        self.exhausted = False
+
+    def start(self):
+        return self
+
+    def collect(self):
+        self.calls += 1
+        return (
+            self.driver.execute_script(
+                self.SCRIPT, self.scroll_box, self.RESERVED_PATHS
+            )
+            or []
+        )
+
+    def advance(self):
+        self.calls += 1
+        return self.driver.execute_script(self.SCROLL_SCRIPT, self.scroll_box)
+
+    def settle(self):
+        self.clock.sleep(self.wait_time)
+
+    def height(self):
+        self.calls += 1
+        return self.driver.execute_script(self.HEIGHT_SCRIPT, self.scroll_box)
+
+    def stalled(self, height, last_height):
+        return height == last_height
+
+    def finished(self, fresh, height, last_height):
+        # Done once the list reports its end, or after stall_limit passes in
+        # a row with no new users and no change in scroll height.
+        if fresh or not self.stalled(height, last_height):
+            self.stalls = 0
+        else:
+            self.stalls += 1
+        return self.exhausted or self.stalls >= self.stall_limit
+
+    def batches(self):
+        last_height = 0
+        while True:
+            with self.metrics.timed("collect") as event:
+                batch = self.collect()
+                event["users"] = len(batch)
+            if batch:
+                yield batch
+            with self.metrics.timed("scroll"):
+                height = self.advance()
+                finished = self.finished(len(batch), height, last_height)
+                if not finished:
+                    self.settle()
+            if finished:
+                break
+            last_height = height
+        with self.metrics.timed("collect") as event:
+            batch = self.collect()
+            event["users"] = len(batch)
+        if batch:
+            yield batch
+
+    def stop(self):
+        pass
+
+
+class DialogHarvester(UserCollector):
+    # A MutationObserver buffers profile links in page memory as rows render;
+    # advance() scrolls and returns as soon as new rows arrive (or on timeout)
+    # together with the drained buffer, so there are no fixed sleeps.
+    INSTALL_SCRIPT = r"""
+        const box = arguments[0], reserved = new Set(arguments[1]);
+        if (box.__igcObserver) return box.__igcBuffer.length;
+        const seen = box.__igcSeen || (box.__igcSeen = new Set());
+        const buffer = (box.__igcBuffer = []);
+        const harvest = (root) => {
+            const anchors = root.matches("a[href]")
+                ? [root]
+                : root.querySelectorAll("a[href]");
+            for (const a of anchors) {
+                let url;
+                try { url = new URL(a.getAttribute("href"), location.href); }
+                catch (e) { continue; }
+                if (url.origin !== location.origin) continue;
+                const parts = url.pathname.split("/").filter(Boolean);
+                if (parts.length !== 1 || reserved.has(parts[0])) continue;
+                if (seen.has(parts[0])) continue;
+                seen.add(parts[0]);
+                buffer.push(parts[0]);
+            }
+            if (box.__igcWake) box.__igcWake();
+        };
+        box.__igcObserver = new MutationObserver((records) => {
+            for (const record of records) {
+                for (const node of record.addedNodes) {
+                    if (node.nodeType === 1) harvest(node);
+                }
+            }
+        });
+        box.__igcObserver.observe(box, { childList: true, subtree: true });
+        harvest(box);
+        return buffer.length;
+    """
+    ADVANCE_SCRIPT = r"""
+        const box = arguments[0], timeout = arguments[1];
+        const done = arguments[arguments.length - 1];
+        const before = box.__igcBuffer.length;
+        let timer = null;
+        const finish = () => {
+            box.__igcWake = null;
+            clearTimeout(timer);
+            done({ users: box.__igcBuffer.splice(0), height: box.scrollHeight });
+        };
+        box.__igcWake = () => {
+            if (box.__igcBuffer.length > before) finish();
+        };
+        timer = setTimeout(finish, timeout);
+        box.scrollTo(0, box.scrollHeight);
+    """
+    DRAIN_SCRIPT = (
+        "return arguments[0].__igcBuffer ? arguments[0].__igcBuffer.splice(0) : [];"
+    )
+    STOP_SCRIPT = r"""
+        const box = arguments[0];
+        if (box.__igcObserver) box.__igcObserver.disconnect();
+        box.__igcObserver = null;
+        box.__igcWake = null;
+    """
+
+    def __init__(self, driver, scroll_box, timeout=4):
+        super().__init__(driver, scroll_box, wait_time=0)
+        self.timeout = timeout
+        self.pending = []
+
+    def start(self):
+        self.calls += 1
+        self.driver.set_script_timeout(self.timeout + 10)
+        self.driver.execute_script(
+            self.INSTALL_SCRIPT, self.scroll_box, self.RESERVED_PATHS
+        )
+        return self
+
+    def collect(self):
+        users, self.pending = self.pending, []
+        if not users:
+            self.calls += 1
+            users = self.driver.execute_script(self.DRAIN_SCRIPT, self.scroll_box)
+        return users or []
+
+    def advance(self):
+        self.calls += 1
+        result = self.driver.execute_async_script(
+            self.ADVANCE_SCRIPT, self.scroll_box, int(self.timeout * 1000)
+        )
+        self.pending.extend(result.get("users") or [])
+        return result.get("height")
+
+    def settle(self):
+        pass
+
+    def stop(self):
+        try:
+            self.driver.execute_script(self.STOP_SCRIPT, self.scroll_box)
+        except Exception:
+            pass
+
+
+class NetworkCollector(UserCollector):
+    # Reads follower/following pages straight from the list API responses in
+    # Chrome's performance log (CDP network events); the dialog is scrolled
+    # only so the page requests the next batch, never to read rows.
+    API_PATTERN = re.compile(r"/api/v1/friendships/[^/]+/(followers|following)/")
+
+    def __init__(
+        self,
+        driver,
+        scroll_box,
+        list_type,
+        timeout=4,
+        poll=0.1,
+        spill_bytes=64 * 1024 * 1024,
+        clock=None,
+    ):
+        super().__init__(driver, scroll_box, wait_time=0)
+        self.list_type = list_type
+        self.timeout = timeout
+        self.poll = poll
+        self.clock = clock or Clock()
+        self.pending = []
+        self.seen = UsernameSet(spill_bytes=spill_bytes)
+        self.requests = set()
+        self.pages = 0
+        self.progressed = False
+
+    def _read_page(self, request_id):
+        self.calls += 1
+        try:
+            body = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except Exception:
+            return []
+        text = body.get("body") or ""
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8", "replace")
+        try:
+            page = json.loads(text)
+        except ValueError:
+            return []
+        self.pages += 1
+        if not page.get("next_max_id"):
+            self.exhausted = True
+        users = []
+        for user in page.get("users") or []:
+            name = user.get("username")
+            if name and self.seen.add(name):
+                users.append(name)
+        return users
+
+    def _poll(self):
+        self.calls += 1
+        fresh = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            params = message.get("params") or {}
+            if message.get("method") == "Network.responseReceived":
+                match = self.API_PATTERN.search(
+                    params.get("response", {}).get("url", "")
+                )
+                if match and match.group(1) == self.list_type:
+                    self.requests.add(params.get("requestId"))
+            elif message.get("method") == "Network.loadingFinished":
+                if params.get("requestId") in self.requests:
+                    self.requests.discard(params["requestId"])
+                    fresh.extend(self._read_page(params["requestId"]))
+        return fresh
+
+    def collect(self):
+        users, self.pending = self.pending, []
+        return users + self._poll()
+
+    def advance(self):
+        self.calls += 1
+        height = self.driver.execute_script(self.SCROLL_SCRIPT, self.scroll_box)
+        self.progressed = False
+        deadline = self.clock.monotonic() + self.timeout
+        while not self.exhausted and self.clock.monotonic() < deadline:
+            fresh = self._poll()
+            if fresh:
+                self.pending.extend(fresh)
+                self.progressed = True
+                break
+            self.clock.sleep(self.poll)
+        return height
+
+    def settle(self):
+        pass
+
+    def stalled(self, height, last_height):
+        return not self.progressed and height == last_height
+
+
+class DialogRows:
+    # Finds a user's row in an open followers/following dialog by the
+    # profile link and clicks that row's button, all inside the page. A
+    # button that already reads "Follow" is left alone.
+    FOLLOW_LABELS = ["follow", "follow back", "ikuti", "ikuti balik"]
+    FIND_ROW = r"""
+        function rowButton(box, name) {
+            for (const a of box.querySelectorAll("a[href]")) {
+                let url;
+                try { url = new URL(a.getAttribute("href"), location.href); }
+                catch (e) { continue; }
+                if (url.origin !== location.origin) continue;
+                if (url.pathname.split("/").filter(Boolean).join("/") !== name) continue;
+                let row = a.parentElement;
+                while (row && row !== box && !row.querySelector("button")) {
+                    row = row.parentElement;
+                }
+                if (row && row !== box) return row.querySelector("button");
+            }
+            return null;
+        }
+    """
+    CLICK_SCRIPT = FIND_ROW + r"""
+        const button = rowButton(arguments[0], arguments[1]);
+        if (!button) return null;
+        const label = (button.innerText || "").trim();
+        if (arguments[2].includes(label.toLowerCase())) return label;
+        button.scrollIntoView({ block: "center" });
+        button.click();
+        return label;
+    """
+
+    def __init__(self, driver, scroll_box):
+        self.driver = driver
+        self.scroll_box = scroll_box
+
+    def click(self, username):
+        # The button's label before the click, or None if the row is not
+        # rendered.
+        try:
+            return self.driver.execute_script(
+                self.CLICK_SCRIPT, self.scroll_box, username, self.FOLLOW_LABELS
+            )
+        except Exception:
+            return None
+
+
+class ActionCheck:
+    # Reads what Instagram shows after an unfollow click: an action-block
+    # dialog ("Try Again Later"), which is dismissed, or the label of the
+    # user's button, which only turns back into "Follow" once the unfollow
+    # has really been applied.
+    BLOCK_PHRASES = [
+        "try again later",
+        "action blocked",
+        "we restrict certain activity",
+        "we limit how often",
+        "coba lagi nanti",
+        "tindakan diblokir",
+        "kami membatasi",
+    ]
+    SCRIPT = DialogRows.FIND_ROW + r"""
+        const box = arguments[0], name = arguments[1], phrases = arguments[2];
+        for (const dialog of document.querySelectorAll("[role='dialog'], [role='alertdialog']")) {
+            if (box && dialog.contains(box)) continue;
+            const text = (dialog.innerText || "").toLowerCase();
+            const phrase = phrases.find((p) => text.includes(p));
+            if (!phrase) continue;
+            const buttons = [...dialog.querySelectorAll("button")];
+            const ok = buttons.find((b) => /^ok/i.test((b.innerText || "").trim()));
+            if (ok || buttons.length) (ok || buttons[buttons.length - 1]).click();
+            return { blocked: phrase };
+        }
+        let button = null;
+        if (box) {
+            button = rowButton(box, name);
+        } else {
+            const labels = /^(follow|follow back|following|requested|ikuti|ikuti balik|mengikuti|diminta)$/i;
+            button = [...document.querySelectorAll("header button")].find(
+                (b) => labels.test((b.innerText || "").trim())
+            ) || null;
+        }
+        return { label: button ? (button.innerText || "").trim() : null };
+    """
+
+    def __init__(self, driver, clock=None):
+        self.driver = driver
+        self.clock = clock or Clock()
+
+    @staticmethod
+    def unfollowed(label):
+        return (label or "").strip().lower() in DialogRows.FOLLOW_LABELS
+
+    def read(self, scroll_box=None, username=None):
+        return (
+            self.driver.execute_script(
+                self.SCRIPT, scroll_box, username, self.BLOCK_PHRASES
+            )
+            or {}
+        )
+
+    def verify(self, scroll_box=None, username=None, timeout=4, interval=0.5):
+        # "done", "blocked", or "unchanged" if the button never flipped.
+        deadline = self.clock.monotonic() + timeout
+        while True:
+            state = self.read(scroll_box, username)
+            if state.get("blocked"):
+                return "blocked"
+            if self.unfollowed(state.get("label")):
+                return "done"
+            if self.clock.monotonic() >= deadline:
+                return "unchanged"
+            self.clock.sleep(interval)
+
+
+class ProfilePrefetcher:
+    # Loads the next target's profile in a second tab while the current
+    # unfollow's sleep and permit wait run. take() swaps that tab to the
+    # front, and the previous tab becomes the spare for the next preload.
+    def __init__(self, driver, url, setup=None):
+        self.driver = driver
+        self.url = url
+        self.setup = setup
+        self.spare = None
+        self.loading = None
+
+    def preload(self, username):
+        if not username or username == self.loading:
+            return
+        current = None
+        try:
+            current = self.driver.current_window_handle
+            if self.spare is None:
+                self.driver.switch_to.new_window("tab")
+                self.spare = self.driver.current_window_handle
+                if self.setup:
+                    self.setup(self.driver)
+            else:
+                self.driver.switch_to.window(self.spare)
+            # Navigating from script returns at once; the tab keeps loading
+            # in the background.
+            self.driver.execute_script(
+                "window.location.href = arguments[0];", self.url(username)
+            )
+            self.loading = username
+        except Exception:
+            # A dead session surfaces on the next unfollow instead.
+            self.loading = None
+        finally:
+            if current is not None:
+                try:
+                    self.driver.switch_to.window(current)
+                except Exception:
+                    pass
+
+    def take(self, username):
+        if self.spare is None or self.loading != username:
+            return False
+        current = self.driver.current_window_handle
+        self.driver.switch_to.window(self.spare)
+        self.spare = current
+        self.loading = None
+        return True
+
+    def close(self):
+        # The spare tab would otherwise outlive the flow in a daemon browser
+        # that is reused across runs.
+        if self.spare is None:
+            return
+        current = self.driver.current_window_handle
+        try:
+            self.driver.switch_to.window(self.spare)
+            self.driver.close()
+        except Exception:
+            pass
+        finally:
+            self.spare = self.loading = None
+            try:
+                self.driver.switch_to.window(current)
+            except Exception:
+                pass
+
+
+class TokenBucket:
+    def __init__(self, capacity, period, tokens=None, updated=None):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity if tokens is None else min(tokens, capacity)
+        self.updated = time.time() if updated is None else updated
+
+    @property
+    def rate(self):
+        return self.capacity / self.period
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+        self.updated = now
+
+    def wait_time(self):
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateScheduler:
+    # Hourly and daily token buckets per account, persisted between runs so
+    # restarting the tool does not reset the budget.
+    PERIODS = {"hourly": 3600, "daily": 86400}
+
+    def __init__(
+        self, account, limits, directory=os.path.join(".meta", "rate"), clock=None
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{account.lower()}.json")
+        self.clock = clock or Clock()
+        self.exhausted = False
+        state = self._load()
+        self.buckets = {}
+        for name, capacity in limits.items():
+            if capacity and capacity > 0:
+                saved = state.get(name, {})
+                if saved.get("capacity") != capacity:
+                    saved = {}
+                self.buckets[name] = TokenBucket(
+                    capacity,
+                    self.PERIODS[name],
+                    saved.get("tokens"),
+                    saved.get("updated", self.clock.time()),
+                )
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    name: {
+                        "capacity": bucket.capacity,
+                        "tokens": bucket.tokens,
+                        "updated": bucket.updated,
+                    }
+                    for name, bucket in self.buckets.items()
+                },
+                f,
+                indent=4,
+            )
+        os.replace(tmp_path, self.path)
+
+    def wait_time(self):
+        now = self.clock.time()
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+        return max([b.wait_time() for b in self.buckets.values()] or [0])
+
+    def take(self):
+        if not self.buckets:
+            return
+        now = self.clock.time()
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+            bucket.tokens -= 1
+        self._save()
+
+    def refund(self):
+        # Attempts that never reached Instagram give their permit back.
+        if not self.buckets:
+            return
+        for bucket in self.buckets.values():
+            bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+        self._save()
+
+    def available(self):
+        self.wait_time()
+        return min([int(b.tokens) for b in self.buckets.values()] or [-1])
+
+
+class CircuitBreaker:
+    # Unfollows that did not take effect are retried after an exponentially
+    # growing delay. An action-block dialog, or FAILURE_LIMIT misses in a
+    # row, opens the breaker: the run pauses, each pause twice as long as
+    # the previous one, and stops once MAX_BLOCKS pauses in a row have not
+    # been followed by a single successful unfollow.
+    def __init__(self, failure_limit=3, pause=900, max_pause=14400, max_blocks=3):
+        self.failure_limit = max(1, failure_limit)
+        self.pause = pause
+        self.max_pause = max_pause
+        self.max_blocks = max_blocks
+        self.failures = 0
+        self.blocks = 0
+        self.streak = 0
+        self.stopped = False
+
+    def success(self):
+        self.failures = 0
+        self.streak = 0
+
+    def failure(self, blocked=False):
+        # True when the breaker should open.
+        self.failures += 1
+        return blocked or self.failures >= self.failure_limit
+
+    def retry_delay(self):
+        return min(self.pause, 2**self.failures)
+
+    def open(self):
+        self.failures = 0
+        self.streak += 1
+        if self.streak > self.max_blocks:
+            self.stopped = True
+            return 0
+        self.blocks += 1
+        return min(self.max_pause, self.pause * 2 ** (self.blocks - 1))
+
+
+class UnfollowJournal:
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, account, directory=os.path.join(".meta", "journal")):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{account.lower()}.jsonl")
+        self.mode = None
+        self.planned = []
+        self.complete = True
+        self.completed = set()
+        self.failures = {}
+        self.open = False
+        self._load()
+        self.file = open(self.path, "a", encoding="utf-8")
+        if self.file.tell() and not self._ends_with_newline():
+            self.file.write("\n")
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                op = entry.get("op")
+                if op == "plan":
+                    self.mode = entry.get("mode")
+                    self.planned = entry.get("users", [])
+                    self.complete = entry.get("complete", True)
+                    self.completed = set()
+                    self.failures = {}
+                    self.open = True
+                elif op == "add":
+                    self.planned.extend(entry.get("users", []))
+                elif op == "complete":
+                    self.complete = True
+                elif op == "done":
+                    self.completed.add(entry.get("user"))
+                elif op == "fail":
+                    user = entry.get("user")
+                    self.failures[user] = self.failures.get(user, 0) + 1
+                elif op == "skip":
+                    self.failures[entry.get("user")] = self.MAX_ATTEMPTS
+                elif op == "end":
+                    self.open = False
+
+    def _write(self, entry):
+        entry["at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def pending(self, mode):
+        if self.open and self.mode == mode:
+            return self.remaining()
+        return []
+
+    def remaining(self):
+        return [
+            user
+            for user in self.planned
+            if user not in self.completed
+            and self.failures.get(user, 0) < self.MAX_ATTEMPTS
+        ]
+
+    def plan(self, mode, users, complete=True):
+        if self.open:
+            self.finish(abandoned=True)
+        self.file.close()
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.mode = mode
+        self.planned = list(users)
+        self.complete = complete
+        self.completed = set()
+        self.failures = {}
+        self.open = True
+        self._write(
+            {
+                "op": "plan",
+                "mode": mode,
+                "users": self.planned,
+                "complete": complete,
+            }
+        )
+
+    def extend(self, users):
+        # Streaming plans grow as the dialog is scrolled.
+        self.planned.extend(users)
+        self._write({"op": "add", "users": list(users)})
+
+    def mark_complete(self):
+        if not self.complete:
+            self.complete = True
+            self._write({"op": "complete"})
+
+    def done(self, user):
+        self.completed.add(user)
+        self._write({"op": "done", "user": user})
+
+    def failed(self, user, error):
+        self.failures[user] = self.failures.get(user, 0) + 1
+        self._write({"op": "fail", "user": user, "error": str(error)[:200]})
+
+    def skip(self, user, error):
+        # Given up on after one attempt, e.g. the account no longer exists.
+        self.failures[user] = self.MAX_ATTEMPTS
+        self._write({"op": "skip", "user": user, "error": str(error)[:200]})
+
+    def finish(self, abandoned=False):
+        if self.open:
+            self._write({"op": "end", "abandoned": abandoned})
+            self.open = False
+
+    def close(self):
+        if self.open and self.complete and not self.remaining():
+            self.finish()
+        self.file.close()
+
+
+class UnfollowWindow:
+    # Feeds "unfollow all" straight from the open dialog: the collector only
+    # scrolls for more rows once the queued ones are used up, and each batch
+    # is appended to the journal plan as it arrives. Users already in the
+    # plan (e.g. when resuming) are skipped.
+    def __init__(self, journal, collector, limit=None):
+        self.journal = journal
+        self.collector = collector
+        self.batches = collector.batches()
+        self.limit = limit
+        self.known = set(journal.planned)
+        self.loaded = 0
+        self.done = False
+
+    def refill(self):
+        while not self.done:
+            try:
+                batch = next(self.batches)
+            except StopIteration:
+                self.finish()
+                break
+            batch = [user for user in batch if user not in self.known]
+            if self.limit is not None:
+                batch = batch[: max(0, self.limit - len(self.journal.planned))]
+            self.known.update(batch)
+            self.loaded += len(batch)
+            if batch:
+                self.journal.extend(batch)
+            if self.limit is not None and len(self.journal.planned) >= self.limit:
+                self.finish()
+            if batch:
+                return batch
+        return []
+
+    def finish(self):
+        if not self.done:
+            self.done = True
+            self.collector.stop()
+            self.journal.mark_complete()
+
+
+class SnapshotStore:
+    KEEP = 30
+
+    def __init__(self, path=os.path.join(".meta", "snapshots.db")):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account TEXT NOT NULL,
+                list_type TEXT NOT NULL,
+                taken_at TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                incremental INTEGER NOT NULL DEFAULT 0,
+                expected INTEGER,
+                exact INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_users (
+                snapshot_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                PRIMARY KEY (snapshot_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshots_account
+                ON snapshots (account, list_type, taken_at);
+            """)
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(snapshots)")]
+        # The count Instagram showed when the list was scanned, and whether
+        # it was the exact title value rather than an abbreviation.
+        for column in ["expected", "exact"]:
+            if column not in columns:
+                self.db.execute(f"ALTER TABLE snapshots ADD COLUMN {column} INTEGER")
+
+    def latest(self, account, list_type):
+        row = self.db.execute(
+            "SELECT id, taken_at, total FROM snapshots WHERE account = ? AND list_type = ? "
+            "ORDER BY taken_at DESC, id DESC LIMIT 1",
+            (account.lower(), list_type),
+        ).fetchone()
+        return row
+
+    def history(self, account, list_type, limit=2):
+        return self.db.execute(
+            "SELECT id, taken_at, total, expected, exact FROM snapshots WHERE account = ? AND list_type = ? "
+            "ORDER BY taken_at DESC, id DESC LIMIT ?",
+            (account.lower(), list_type, limit),
+        ).fetchall()
+
+    def users(self, snapshot_id):
+        return (
+            name
+            for (name,) in self.db.execute(
+                "SELECT username FROM snapshot_users WHERE snapshot_id = ? ORDER BY position",
+                (snapshot_id,),
+            )
+        )
+
+    def save(
+        self, account, list_type, users, incremental=False, expected=None, exact=False
+    ):
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO snapshots (account, list_type, taken_at, total, incremental, expected, exact) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    account.lower(),
+                    list_type,
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    len(users),
+                    int(incremental),
+                    expected,
+                    int(exact),
+                ),
+            )
+            snapshot_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO snapshot_users (snapshot_id, position, username) VALUES (?, ?, ?)",
+                ((snapshot_id, i, name) for i, name in enumerate(users)),
+            )
+            stale = [
+                sid
+                for (sid,) in self.db.execute(
+                    "SELECT id FROM snapshots WHERE account = ? AND list_type = ? "
+                    "ORDER BY taken_at DESC, id DESC LIMIT -1 OFFSET ?",
+                    (account.lower(), list_type, self.KEEP),
+                )
+            ]
+            for sid in stale:
+                self.db.execute(
+                    "DELETE FROM snapshot_users WHERE snapshot_id = ?", (sid,)
+                )
+                self.db.execute("DELETE FROM snapshots WHERE id = ?", (sid,))
+        return snapshot_id
+
+    def close(self):
+        self.db.close()
+
+
+class IncrementalScan:
+    # Lists are newest first: once stop_run consecutive usernames match the
+    # previous snapshot, the rest of the list is taken from that snapshot,
+    # starting where the matching run began.
+    def __init__(self, previous=None, stop_run=50, spill_bytes=64 * 1024 * 1024):
+        self.previous = previous if previous is not None else UsernameSet()
+        self.stop_run = stop_run
+        self.seen = UsernameSet(spill_bytes=spill_bytes)
+        self.fresh = []
+        self.tail_start = 0
+        self.run = 0
+        self.run_start = None
+        self.stopped = False
+        self.snapshot_id = None
+
+    def add(self, batch):
+        self.fresh = []
+        for name in batch:
+            if not self.seen.add(name):
+                continue
+            self.fresh.append(name)
+            position = self.previous.position(name)
+            if position >= 0:
+                if self.run == 0:
+                    self.run_start = position
+                self.run += 1
+                if self.run >= self.stop_run:
+                    self.stopped = True
+            else:
+                self.run = 0
+        return self.stopped
+
+    def result(self):
+        # Returns the UsernameSet itself; names taken from the previous
+        # snapshot start at byte position tail_start.
+        self.tail_start = self.seen.size
+        if self.stopped and self.run_start is not None:
+            self.seen.update(self.previous.iter_from(self.run_start))
+            self.run_start = None
+        return self.seen
+
+    def close(self):
+        self.previous.close()
+
+
+class ExportWriter:
+    # Appends usernames to the export file as they are collected and fsyncs
+    # every flush_every rows, so a crash keeps everything up to the last
+    # flush. finish(sort=True) sorts and dedupes out of core: sorted runs of
+    # `chunk` names go to temp files and are k-way merged into the target.
+    FORMATS = ["csv", "txt", "jsonl"]
+    MARKER_SUFFIX = ".done.json"
+    # Dialogs usually list a few users fewer than the count Instagram shows
+    # (deactivated accounts), and an abbreviated count such as "12.5K" is
+    # only accurate to its last digit, so a scan within these margins of the
+    # count still counts as complete.
+    SHORTFALL = 0.02
+    SHORTFALL_ABBREVIATED = 0.05
+    SHORTFALL_MIN = 10
+
+    @classmethod
+    def shortfall(cls, rows, expected, exact=False):
+        if not expected:
+            return None
+        margin = cls.SHORTFALL if exact else cls.SHORTFALL_ABBREVIATED
+        if expected - rows <= max(cls.SHORTFALL_MIN, expected * margin):
+            return None
+        return f"only {rows} of {'' if exact else 'about '}{expected}"
+
+    @classmethod
+    def mark_complete(cls, path, rows, expected=None, snapshot_id=None, exact=False):
+        # Written once an export is finished: Offline Diff only trusts
+        # files that have one and hold about as many rows as Instagram showed.
+        with open(path + cls.MARKER_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "rows": rows,
+                    "expected": expected,
+                    "exact": exact,
+                    "snapshot_id": snapshot_id,
+                },
+                f,
+            )
+
+    @classmethod
+    def read_marker(cls, path):
+        try:
+            with open(path + cls.MARKER_SUFFIX, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def problem(cls, path):
+        marker = cls.read_marker(path)
+        if marker is None:
+            return "no completion marker, the export may have been cut short"
+        short = cls.shortfall(
+            marker["rows"], marker.get("expected"), marker.get("exact", False)
+        )
+        return f"{short} rows" if short else None
+
+    def __init__(self, path, export_format, flush_every=500):
+        self.path = path
+        self.format = export_format
+        self.encoding = "utf-8-sig" if export_format == "csv" else "utf-8"
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self.unflushed = 0
+        self.file = open(path, "w", encoding=self.encoding, newline="")
+        self._header(self.file)
+
+    def _header(self, f):
+        if self.format == "csv":
+            f.write("username\n")
+
+    def _line(self, user):
+        if self.format == "jsonl":
+            return json.dumps({"username": user}) + "\n"
+        return user + "\n"
+
+    def _records(self, path):
+        with open(path, "r", encoding=self.encoding) as f:
+            if self.format == "csv":
+                next(f, None)
+            for line in f:
+                line = line.rstrip("\r\n")
+                if not line:
+                    continue
+                yield json.loads(line)["username"] if self.format == "jsonl" else line
+
+    def add(self, users):
+        for user in users:
+            self.file.write(self._line(user))
+            self.count += 1
+            self.unflushed += 1
+            if self.unflushed >= self.flush_every:
+                self.flush()
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unflushed = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def finish(self, sort=False, chunk=100_000):
+        self.close()
+        if sort:
+            self.count = self.sort(chunk)
+        return self.count
+
+    def sort(self, chunk=100_000):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        runs = []
+        try:
+            records = self._records(self.path)
+            while True:
+                block = sorted(set(itertools.islice(records, chunk)))
+                if not block:
+                    break
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=directory, suffix=".run", delete=False
+                ) as run:
+                    run.writelines(user + "\n" for user in block)
+                runs.append(run.name)
+            handles = [open(name, "r", encoding="utf-8") for name in runs]
+            tmp_path = self.path + ".tmp"
+            count = 0
+            try:
+                with open(tmp_path, "w", encoding=self.encoding, newline="") as out:
+                    self._header(out)
+                    last = None
+                    for user in heapq.merge(
+                        *((line.rstrip("\n") for line in h) for h in handles)
+                    ):
+                        if user != last:
+                            out.write(self._line(user))
+                            count += 1
+                            last = user
+                    out.flush()
+                    os.fsync(out.fileno())
+            finally:
+                for h in handles:
+                    h.close()
+            os.replace(tmp_path, self.path)
+            return count
+        finally:
+            for name in runs:
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+
+class ExportReader:
+    # Loads the usernames of an export file of any format. csv, xlsx, json
+    # and jsonl are read column-wise by pandas; txt line by line.
+    NAME = re.compile(
+        r"^(?P<account>.+)_(?P<list_type>followers|following)_"
+        r"(?P<stamp>\d{8}_\d{6})\.(?P<format>csv|xlsx|json|jsonl|txt)$"
+    )
+
+    @classmethod
+    def describe(cls, path):
+        match = cls.NAME.match(os.path.basename(path))
+        return match.groupdict() if match else None
+
+    @staticmethod
+    def column(path):
+        export_format = os.path.splitext(path)[1].lower().lstrip(".")
+        if export_format == "txt":
+            with open(path, "r", encoding="utf-8-sig") as f:
+                return pd.Series(f.read().splitlines(), dtype=str)
+        if export_format == "csv":
+            frame = pd.read_csv(
+                path,
+                usecols=["username"],
+                dtype=str,
+                encoding="utf-8-sig",
+                keep_default_na=False,
+            )
+        elif export_format == "xlsx":
+            frame = pd.read_excel(
+                path, usecols=["username"], dtype=str, keep_default_na=False
+            )
+        elif export_format in ("json", "jsonl"):
+            frame = pd.read_json(
+                path,
+                orient="records",
+                lines=export_format == "jsonl",
+                dtype={"username": str},
+            )
+        else:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        return frame["username"]
+
+    @classmethod
+    def load(cls, path, spill_bytes=64 * 1024 * 1024):
+        names = cls.column(path).astype(str).str.strip().str.lstrip("@")
+        return UsernameSet(names[names != ""], spill_bytes)
+
+
+class FollowDiff:
+    # Set algebra over collected lists. `previous` is an older followers
+    # list and enables the new/lost follower reports.
+    REPORTS = ["non_followers", "fans", "mutuals", "new_followers", "lost_followers"]
+
+    def __init__(self, followers, following, previous=None):
+        self.followers = followers
+        self.following = following
+        self.previous = previous
+
+    def non_followers(self):
+        return self.following.difference(self.followers)
+
+    def fans(self):
+        return self.followers.difference(self.following)
+
+    def mutuals(self):
+        return (name for name in self.following if name in self.followers)
+
+    def new_followers(self):
+        return self.followers.difference(self.previous) if self.previous else iter(())
+
+    def lost_followers(self):
+        return self.previous.difference(self.followers) if self.previous else iter(())
+
+    def write(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        counts = {}
+        for report in self.REPORTS:
+            if report in ("new_followers", "lost_followers") and not self.previous:
+                continue
+            counts[report] = 0
+            with open(
+                os.path.join(directory, f"{report}.txt"), "w", encoding="utf-8"
+            ) as f:
+                for name in getattr(self, report)():
+                    f.write(name + "\n")
+                    counts[report] += 1
+        return counts
+
+
+class TargetList:
+    # Unfollow targets computed offline, picked up by the next non-follower
+    # run of the same account instead of scanning both lists.
+    def __init__(self, account, directory=os.path.join(".meta", "targets")):
+        self.path = os.path.join(directory, f"{account.lower()}.json")
+
+    def save(self, users, sources):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "sources": sources,
+                    "users": list(users),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Dashboard:
+    # Live progress lines for the scan and unfollow loops in place of a
+    # printed line per user. Rich redraws at most `refresh` times a second
+    # from its own thread, so the loops only set numbers. Tasks from
+    # parallel scans share one display.
+    def __init__(self, console, refresh=4):
+        self.console = console
+        self.refresh = refresh
+        self.progress = None
+        self.users = 0
+        self.errors = {}
+        self.lock = threading.Lock()
+
+    def _start(self):
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            ProgressColumn,
+            TextColumn,
+            TimeRemainingColumn,
+        )
+
+        class StatusColumn(ProgressColumn):
+            # Rate, a countdown while the loop sleeps, and the error count.
+            def render(self, task):
+                parts = []
+                if task.speed:
+                    parts.append(f"{task.speed:.1f}/s")
+                left = task.fields.get("until", 0) - time.monotonic()
+                if left > 0:
+                    parts.append(
+                        f"[yellow]{task.fields.get('status', '')} {math.ceil(left)}s[/yellow]"
+                    )
+                if task.fields.get("errors"):
+                    parts.append(f"[red]{task.fields['errors']} errors[/red]")
+                return Text.from_markup("  ".join(parts))
+
+        progress = Progress(
+            TextColumn("[bold cyan]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeRemainingColumn(),
+            StatusColumn(),
+            console=self.console,
+            refresh_per_second=max(0.1, self.refresh),
+        )
+        progress.start()
+        return progress
+
+    @contextlib.contextmanager
+    def task(self, description, total=None):
+        if self.console is None:
+            yield None
+            return
+        with self.lock:
+            if self.users == 0:
+                self.progress = self._start()
+            self.users += 1
+        task = self.progress.add_task(description, total=total, until=0, errors=0)
+        try:
+            yield task
+        finally:
+            with self.lock:
+                self.errors.pop(task, None)
+                self.users -= 1
+                if self.users == 0:
+                    self.progress.stop()
+                    self.progress = None
+
+    def update(self, task, **fields):
+        if task is not None:
+            self.progress.update(task, **fields)
+
+    def error(self, task):
+        if task is not None:
+            self.errors[task] = self.errors.get(task, 0) + 1
+            self.progress.update(task, errors=self.errors[task])
+
+    def countdown(self, task, status, seconds):
+        self.update(task, status=status, until=time.monotonic() + seconds)
 
 
-class CommandRunner:
-    def __init__(self, console, logger):
-        self.console, self.logger = console, logger
-        self.is_windows = platform.system() == "Windows"
+class RunMetrics:
+    # One JSON line per timed phase in .meta/metrics/<flow>_<time>.jsonl and a
+    # closing summary line (p50/p95 per phase, users per second). Without a
+    # flow name nothing is written. A known account goes into the file name.
+    def __init__(
+        self,
+        flow=None,
+        directory=os.path.join(".meta", "metrics"),
+        clock=None,
+        account="",
+    ):
+        self.flow = flow
+        self.account = account
+        self.clock = clock or Clock()
+        self.durations = {}
+        self.counts = {}
+        self.started = self.clock.monotonic()
+        self.lock = threading.Lock()
+        self.path = None
+        self.file = None
+        if flow:
+            os.makedirs(directory, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            name = f"{flow}_{account}" if account else flow
+            self.path = os.path.join(directory, f"{name}_{stamp}.jsonl")
+            self.file = open(self.path, "a", encoding="utf-8", buffering=1)
 
-    def clear_screen(self):
-        subprocess.run("cls" if self.is_windows else "clear", shell=True)
+    def _write(self, entry):
+        if self.file:
+            with self.lock:
+                self.file.write(json.dumps(entry) + "\n")
 
-    def run(self, cmd, success="", fail=""):
+    @contextlib.contextmanager
+    def timed(self, phase, **fields):
+        started = self.clock.monotonic()
         try:
-            subprocess.check_call(cmd)
-            if success:
-                self.console.print(success, "green")
-        except subprocess.CalledProcessError as e:
-            if fail:
-                self.console.print(f"{fail} {e}", "red")
-            self.logger.error(f"{fail} {e}")
-            sys.exit(1)
+            yield fields
+        finally:
+            self.record(phase, self.clock.monotonic() - started, **fields)
 
+    def record(self, phase, secs, **fields):
+        with self.lock:
+            self.durations.setdefault(phase, []).append(secs)
+        self._write(
+            {
+                "phase": phase,
+                "secs": round(secs, 4),
+                "at": datetime.fromtimestamp(self.clock.time()).isoformat(
+                    timespec="milliseconds"
+                ),
+                **fields,
+            }
+        )
 
-class DependencyInstaller:
-    def __init__(self, console, logger, packages=None):
-        self.console, self.logger, self.packages = console, logger, packages or []
+    def count(self, name, n=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + n
 
-    def check_and_install(self):
-        self.console.print("\n>> Checking Python packages...", "cyan")
-        for pkg in self.packages:
-            try:
-                __import__(pkg)
-                self.console.print(f"[✓] {pkg} already installed.", "green")
-            except ImportError:
-                self.console.print(f"[✓] {pkg} missing. Installing...", "yellow")
-                try:
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
-                    self.console.print(f"[✓] {pkg} installed.", "green")
-                except subprocess.CalledProcessError:
-                    self.console.print(f"Failed to install {pkg}", "red")
-                    self.logger.error(f"Could not install {pkg}")
-                    sys.exit(1)
+    @staticmethod
+    def percentile(values, q):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def summary(self):
+        secs = self.clock.monotonic() - self.started
+        return {
+            "phase": "summary",
+            "flow": self.flow,
+            "account": self.account,
+            "secs": round(secs, 3),
+            "phases": {
+                phase: {
+                    "n": len(values),
+                    "total": round(sum(values), 3),
+                    "p50": round(self.percentile(values, 0.5), 4),
+                    "p95": round(self.percentile(values, 0.95), 4),
+                    "max": round(max(values), 4),
+                }
+                for phase, values in self.durations.items()
+            },
+            "counts": dict(self.counts),
+            "per_sec": {
+                name: round(n / secs, 2) if secs else 0
+                for name, n in self.counts.items()
+            },
+        }
+
+    def close(self):
+        if not self.file:
+            return None
+        summary = self.summary()
+        self._write(summary)
+        self.file.close()
+        self.file = None
+        return summary
 
 
 class MainMenu:
-    def __init__(self, console, logger, cmd, logo, deps, system):
+    def __init__(
+        self, console, logger, cmd, logo, deps, system, clock=None, driver_factory=None
+    ):
         self.console = console
         self.logger = logger
         self.cmd = cmd
         self.logo = logo
         self.deps = deps
         self.system = system
+        self.clock = clock or Clock()
+        self.driver_factory = driver_factory or self.get_chrome_driver
+        self.lean = None
+        # Set by CommandLine: prompts are answered from `answers` and
+        # `overrides` take precedence over settings.json.
+        self.answers = None
+        self.overrides = {}
+        self.last_summary = None
+        self.dashboard = Dashboard(getattr(console, "console", None))
+        self.metrics = RunMetrics()
         self.options = {
             "1": (
                 "[bold bright_cyan]Auto Unfollow: All Followers[/bold bright_cyan]",
@@ -203,6 +2260,14 @@ class MainMenu:
                 "[bold bright_yellow]Settings & Limits[/bold bright_yellow]",
                 self.settings_menu,
             ),
+            "6": (
+                "[bold bright_white]Offline Diff: Compare Exports/Snapshots[/bold bright_white]",
+                self.offline_diff,
+            ),
+            "7": (
+                "[bold bright_cyan]Collect Followers/Following Snapshots[/bold bright_cyan]",
+                self.collect_lists,
+            ),
             "0": (
                 "[bold bright_red]Exit[/bold bright_red]",
                 self.exit_program,
@@ -263,11 +2328,53 @@ class MainMenu:
             self.logger.exception("Unhandled exception")
             sys.exit(1)
 
+    def ask(self, key, prompt, choices=None):
+        if self.answers is None:
+            return self.console.prompt_choice(prompt, choices)
+        answer = self.answers.get(key, "")
+        self.logger.info(f"{prompt.strip()} {answer}")
+        return answer
+
+    def read_line(self, prompt, key=None):
+        # Plain input() prompts; batch runs skip the "Press Enter" pauses.
+        if self.answers is None:
+            return input(prompt)
+        return self.answers.get(key, "") if key else ""
+
     def get_chrome_driver(self):
+        settings = self.load_settings(announce=False)
         chrome_options = Options()
-        chrome_options.add_argument("--start-maximized")
-        user_data_dir = os.path.join(os.getcwd(), "chrome_profile_ig_cleaner")
-        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+        user_data_dir = os.path.join(
+            os.getcwd(),
+            settings.get("CHROME_PROFILE_DIR", "chrome_profile_ig_cleaner"),
+        )
+        lean = (
+            LeanBrowser(
+                user_data_dir,
+                settings.get("DISK_CACHE_MB", 0),
+                settings.get("HEADLESS_AFTER_LOGIN", False),
+            )
+            if settings.get("LEAN_BROWSER")
+            else None
+        )
+        if settings.get("BROWSER_DAEMON"):
+            chrome_options.debugger_address = BrowserDaemon(
+                user_data_dir,
+                port=settings.get("DAEMON_PORT", 9222),
+                binary=settings.get("CHROME_BINARY", ""),
+                logger=self.logger,
+                args=lean.arguments() if lean else (),
+            ).ensure()
+        else:
+            chrome_options.add_argument("--start-maximized")
+            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+            if lean and lean.configure(chrome_options):
+                self.console.print(
+                    "[cyan]🕶️ Saved login found, running Chrome headless.[/cyan]"
+                )
+        capture = settings.get("COLLECT_MODE") == "network"
+        if capture:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         system_os = platform.system()
         if system_os == "Windows":
             driver_path = os.path.join("drivers", "chromedriver.exe")
@@ -279,86 +2386,596 @@ class MainMenu:
             raise FileNotFoundError(f"ChromeDriver not found at: {driver_path}")
         service = Service(driver_path)
         try:
-            return webdriver.Chrome(service=service, options=chrome_options)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            if capture:
+                driver.execute_cdp_cmd(
+                    "Network.enable",
+                    {
+                        "maxTotalBufferSize": 64 * 1024 * 1024,
+                        "maxResourceBufferSize": 8 * 1024 * 1024,
+                    },
+                )
+            if lean:
+                lean.attach(driver, network_enabled=capture)
+            self.lean = lean
+            return driver
         except Exception as e:
             self.console.print(f"[red]❌ Failed to start ChromeDriver: {e}[/red]")
             raise
 
-    def start_unfollow(self):
+    def new_driver(self):
+        load_selenium()
+        try:
+            return self.driver_factory()
+        except Exception:
+            self.metrics.count("driver_errors")
+            raise
+
+    @contextlib.contextmanager
+    def run_metrics(self, flow):
+        settings = self.load_settings(announce=False)
+        self.metrics = RunMetrics(
+            flow if settings.get("METRICS", True) else None,
+            clock=self.clock,
+            account=(self.answers or {}).get("username", ""),
+        )
+        self.dashboard.refresh = settings.get("DASHBOARD_REFRESH", 4)
+        try:
+            yield self.metrics
+        finally:
+            summary = self.last_summary = self.metrics.close()
+            if summary:
+                rates = ", ".join(
+                    f"{name}: {rate}/s" for name, rate in summary["per_sec"].items()
+                )
+                self.console.print(
+                    f"[cyan]📈 Run took {summary['secs']:.0f}s{' (' + rates + ')' if rates else ''}. Metrics saved to {self.metrics.path}[/cyan]"
+                )
+                self.logger.info(f"Run metrics saved to {self.metrics.path}")
+            self.metrics = RunMetrics()
+
+    def load_settings(self, announce=True):
         config_path = "settings.json"
+        settings = dict(DEFAULT_SETTINGS)
         if not os.path.exists(config_path):
+            if announce:
+                self.console.print(
+                    "[yellow]⚠️ No settings file found. Using default values.[/yellow]"
+                )
+        else:
+            with open(config_path, "r") as f:
+                settings.update(json.load(f))
+        settings.update(self.overrides)
+        return settings
+
+    def start_scan(self, account, list_type, settings):
+        spill_bytes = int(settings.get("SET_SPILL_MB", 64) * 1024 * 1024)
+        previous = UsernameSet(spill_bytes=spill_bytes)
+        if settings.get("INCREMENTAL_SCAN"):
+            store = SnapshotStore()
+            try:
+                latest = store.latest(account, list_type)
+                if latest:
+                    previous.update(store.users(latest[0]))
+                    self.console.print(
+                        f"[cyan]🗂️ Last {list_type} snapshot: {latest[1]} ({latest[2]} users)[/cyan]"
+                    )
+            finally:
+                store.close()
+        return IncrementalScan(
+            previous, settings.get("INCREMENTAL_STOP_RUN", 50), spill_bytes
+        )
+
+    def save_snapshot(self, account, list_type, scan, expected=None, exact=False):
+        users = scan.result()
+        scan.close()
+        if scan.stopped:
             self.console.print(
-                "[yellow]⚠️ No settings file found. Using default values.[/yellow]"
+                f"[cyan]⚡ Stopped early: {scan.run} {list_type} matched the last snapshot.[/cyan]"
+            )
+        try:
+            store = SnapshotStore()
+            try:
+                scan.snapshot_id = store.save(
+                    account,
+                    list_type,
+                    users,
+                    incremental=scan.stopped,
+                    expected=expected,
+                    exact=exact,
+                )
+            finally:
+                store.close()
+        except sqlite3.Error as e:
+            self.console.print(
+                f"[red]⚠️ Could not save {list_type} snapshot: {e}[/red]"
+            )
+            self.logger.error(f"Snapshot save failed: {e}")
+        return users
+
+    def resume_journal(self, journal, mode):
+        remaining = journal.pending(mode)
+        if not remaining:
+            return None
+        answer = self.ask(
+            "confirm",
+            f"\n♻️ Unfinished run found ({len(remaining)} of {len(journal.planned)} left). Resume it? (y/n): ",
+            choices=["y", "n"],
+        )
+        if answer.lower() == "y":
+            self.console.print(
+                f"[cyan]♻️ Resuming {len(remaining)} unfollows without rescanning.[/cyan]"
+            )
+            return remaining
+        if self.answers is not None:
+            # Unattended: keep the journal rather than abandon it.
+            self.console.print(
+                "[yellow]♻️ Unfinished run left in place. Run again with --yes to resume it.[/yellow]"
+            )
+            return False
+        journal.finish(abandoned=True)
+        return None
+
+    def make_scheduler(self, account, settings):
+        scheduler = RateScheduler(
+            account,
+            {
+                "hourly": settings.get("HOURLY_LIMIT", 0),
+                "daily": settings.get("DAILY_LIMIT", 0),
+            },
+            clock=self.clock,
+        )
+        if scheduler.buckets:
+            self.console.print(
+                f"[cyan]🧮 Rate budget available now: {scheduler.available()} unfollows[/cyan]"
+            )
+        return scheduler
+
+    # Errors after which nothing more can be sent to the browser.
+    SESSION_ERRORS = [
+        "invalid session id",
+        "no such window",
+        "target window already closed",
+        "session deleted",
+        "chrome not reachable",
+        "disconnected",
+    ]
+
+    @classmethod
+    def session_lost(cls, error):
+        if isinstance(error, ConnectionError):
+            return True
+        if not isinstance(error, WebDriverException):
+            return False
+        message = str(error).lower()
+        return any(phrase in message for phrase in cls.SESSION_ERRORS)
+
+    def make_breaker(self, settings):
+        return CircuitBreaker(
+            settings.get("FAILURE_LIMIT", 3),
+            settings.get("BLOCK_PAUSE", 900),
+            settings.get("BLOCK_PAUSE_MAX", 14400),
+            settings.get("MAX_BLOCKS", 3),
+        )
+
+    def wait_for_permit(self, scheduler, settings, task=None):
+        wait = scheduler.wait_time()
+        if wait > settings.get("RATE_MAX_WAIT", 900):
+            resume_at = datetime.fromtimestamp(self.clock.time() + wait).strftime(
+                "%H:%M"
+            )
+            self.console.print(
+                f"[yellow]🧮 Hourly/daily unfollow budget used up. Next unfollow allowed at {resume_at}.[/yellow]"
+            )
+            return False
+        if wait > 0:
+            self.logger.info(f"Waiting {math.ceil(wait)}s for the unfollow budget")
+            self.dashboard.countdown(task, "rate limit", wait)
+            with self.metrics.timed("rate_wait"):
+                self.clock.sleep(wait)
+        scheduler.take()
+        return True
+
+    def unfollow_queue(
+        self,
+        driver,
+        journal,
+        rows,
+        settings,
+        limit,
+        scheduler,
+        window=None,
+        breaker=None,
+    ):
+        BATCH_DELAY = settings.get("BATCH_DELAY", 20)
+        SLEEP_BETWEEN = tuple(settings.get("SLEEP_BETWEEN", [2, 5]))
+        SLEEP_AFTER_BATCH = settings.get("SLEEP_AFTER_BATCH", 60)
+        queue = journal.remaining()
+        fallback = []
+        cursor = {"queue": 0, "fallback": 0}
+
+        def targets():
+            while True:
+                if cursor["queue"] == len(queue):
+                    batch = window.refill() if window else []
+                    if not batch:
+                        break
+                    queue.extend(batch)
+                cursor["queue"] += 1
+                yield queue[cursor["queue"] - 1], rows
+            while cursor["fallback"] < len(fallback):
+                cursor["fallback"] += 1
+                yield fallback[cursor["fallback"] - 1], None
+
+        def next_profile():
+            # The next target opened by profile, if it is known yet.
+            if cursor["queue"] < len(queue):
+                return queue[cursor["queue"]] if rows is None else None
+            if window and not window.done:
+                return None
+            if cursor["fallback"] < len(fallback):
+                return fallback[cursor["fallback"]]
+            return None
+
+        prefetcher = (
+            ProfilePrefetcher(
+                driver,
+                lambda user: f"{IG_BASE_URL}/{user}/",
+                self.lean.attach if self.lean else None,
+            )
+            if settings.get("PREFETCH_PROFILES", True)
+            else None
+        )
+
+        def retry_later(user, dialog_rows):
+            if journal.failures.get(user, 0) < journal.MAX_ATTEMPTS:
+                (fallback if dialog_rows is None else queue).append(user)
+
+        breaker = breaker or self.make_breaker(settings)
+        unfollowed = 0
+        missed = 0
+        skipped = 0
+        scheduler.exhausted = False
+        tabs = (
+            contextlib.closing(prefetcher) if prefetcher else contextlib.nullcontext()
+        )
+        with tabs, self.dashboard.task("Unfollowing", total=limit) as task:
+            for user, dialog_rows in targets():
+                if unfollowed >= limit or breaker.stopped:
+                    break
+                if not self.wait_for_permit(scheduler, settings, task):
+                    scheduler.exhausted = True
+                    break
+                try:
+                    with self.metrics.timed(
+                        "unfollow",
+                        user=user,
+                        route="dialog" if dialog_rows is not None else "profile",
+                    ) as event:
+                        if dialog_rows is None:
+                            result = self.unfollow_from_profile(
+                                driver, user, prefetcher
+                            )
+                        else:
+                            result = self.unfollow_from_dialog(
+                                driver, dialog_rows, user
+                            )
+                        event["result"] = result
+                        if result == "missing":
+                            event["route"] = "dialog_miss"
+                except Exception as e:
+                    if self.session_lost(e):
+                        # Chrome is gone: every later target would fail the
+                        # same way. Nothing is written for this user, so the
+                        # journal resumes from it next run.
+                        scheduler.refund()
+                        self.logger.error(f"Browser session lost at @{user}: {e}")
+                        self.console.print(
+                            f"[bold red]💥 Lost the browser session. {unfollowed} unfollowed this batch; the journal resumes from @{user} next run.[/bold red]"
+                        )
+                        raise
+                    result = "error"
+                    error = e
+                if prefetcher:
+                    prefetcher.preload(next_profile())
+                if result == "not_found":
+                    # A deleted or renamed account: not a sign of rate
+                    # limiting, and retrying cannot help, so it is skipped
+                    # without touching the breaker.
+                    scheduler.refund()
+                    journal.skip(user, "profile not found")
+                    skipped += 1
+                    self.metrics.count("unfollow_not_found")
+                    self.dashboard.error(task)
+                    self.logger.warning(f"Skipped @{user}: profile not found")
+                    continue
+                if result == "error":
+                    # A page that did not load or a click that missed: retried
+                    # up to MAX_ATTEMPTS times, without touching the breaker.
+                    scheduler.refund()
+                    journal.failed(user, error)
+                    retry_later(user, dialog_rows)
+                    missed += 1
+                    self.metrics.count("unfollow_error")
+                    self.dashboard.error(task)
+                    self.logger.warning(f"Unfollow of @{user} failed: {error}")
+                    continue
+                if result in ("missing", "already"):
+                    scheduler.refund()
+                    if result == "missing":
+                        fallback.append(user)
+                    else:
+                        journal.done(user)
+                    continue
+                if result == "done":
+                    breaker.success()
+                    journal.done(user)
+                    self.metrics.count("unfollowed")
+                    unfollowed += 1
+                    self.logger.info(f"Unfollowed @{user} ({unfollowed}/{limit})")
+                    self.dashboard.update(task, completed=unfollowed)
+                    pause = self.clock.uniform(*SLEEP_BETWEEN)
+                    self.dashboard.countdown(task, "next in", pause)
+                    with self.metrics.timed("sleep"):
+                        self.clock.sleep(pause)
+                    if unfollowed % BATCH_DELAY == 0:
+                        self.logger.info(f"Cooling down for {SLEEP_AFTER_BATCH}s")
+                        self.dashboard.countdown(
+                            task, "cooling down", SLEEP_AFTER_BATCH
+                        )
+                        with self.metrics.timed("cooldown"):
+                            self.clock.sleep(SLEEP_AFTER_BATCH)
+                    continue
+                missed += 1
+                self.metrics.count("unfollow_" + result)
+                self.dashboard.error(task)
+                if result == "blocked":
+                    self.logger.warning(f"Unfollow of @{user} blocked by Instagram")
+                elif result == "unchanged":
+                    journal.failed(user, "button did not change to Follow")
+                    self.logger.warning(f"Unfollow of @{user} did not take effect")
+                retry_later(user, dialog_rows)
+                if not breaker.failure(blocked=result == "blocked"):
+                    self.clock.sleep(breaker.retry_delay())
+                    continue
+                pause = breaker.open()
+                if breaker.stopped:
+                    self.console.print(
+                        f"[bold red]🛑 Instagram kept limiting unfollows after {breaker.max_blocks} pauses. Stopping; the journal resumes from here next run.[/bold red]"
+                    )
+                    break
+                resume_at = datetime.fromtimestamp(self.clock.time() + pause).strftime(
+                    "%H:%M"
+                )
+                self.console.print(
+                    f"[yellow]🧱 Unfollows are being limited. {unfollowed} confirmed so far; pausing until {resume_at} ({pause // 60} min).[/yellow]"
+                )
+                self.dashboard.countdown(task, "blocked, paused", pause)
+                with self.metrics.timed("block_pause", blocks=breaker.blocks):
+                    self.clock.sleep(pause)
+        self.console.print(
+            f"[cyan]📊 Confirmed unfollows: {unfollowed}, not applied: {missed}, skipped: {skipped}, block pauses: {breaker.blocks}[/cyan]"
+        )
+        return unfollowed
+
+    def collect_list(self, driver, username, list_type, settings):
+        with self.metrics.timed("profile_nav", list=list_type):
+            driver.get(f"{IG_BASE_URL}/{username}/")
+        try:
+            expected, exact = self.read_shown_count(driver, list_type)
+        except Exception:
+            expected, exact = None, False
+        opened = self.clock.monotonic()
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable(
+                    (By.XPATH, f"//a[contains(@href, '/{list_type}')]")
+                )
+            ).click()
+            self.clock.sleep(2)
+        except Exception as e:
+            self.console.print(f"[red]❌ Failed to open {list_type}: {e}[/red]")
+            return None, None
+        self.console.print(f"[blue]📥 Fetching {list_type}...[/blue]")
+        try:
+            scroll_box = WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located(
+                    (
+                        By.XPATH,
+                        "//div[@role='dialog']//div[contains(@style, 'overflow')]",
+                    )
+                )
+            )
+        except TimeoutException:
+            self.console.print(f"[red]❌ Timeout opening {list_type} list.[/red]")
+            return None, None
+        self.metrics.record(
+            "dialog_open", self.clock.monotonic() - opened, list=list_type
+        )
+        scan = self.start_scan(username, list_type, settings)
+        collector = self.make_collector(driver, scroll_box, settings, list_type)
+        with self.dashboard.task(f"Scanning {list_type}") as task:
+            for batch in collector.batches():
+                if scan.add(batch):
+                    break
+                self.dashboard.update(task, completed=len(scan.seen))
+        collector.stop()
+        users = self.save_snapshot(username, list_type, scan, expected, exact)
+        self.metrics.count("users_collected", len(users))
+        return users, scroll_box
+
+    def collect_in_new_session(self, username, list_type, settings):
+        driver = self.new_driver()
+        try:
+            driver.switch_to.new_window("window")
+            users, _ = self.collect_list(driver, username, list_type, settings)
+            return users
+        finally:
+            try:
+                driver.close()
+            except Exception:
+                pass
+            driver.quit()
+
+    def confirm_unfollow(self, driver, timeout=5):
+        WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable(
+                (
+                    By.XPATH,
+                    "//button[contains(text(),'Unfollow') or contains(text(),'Berhenti')]",
+                )
+            )
+        ).click()
+
+    def unfollow_from_dialog(self, driver, rows, user):
+        # "done", "already", "missing" (row not rendered), "blocked" or
+        # "unchanged".
+        label = rows.click(user)
+        if label is None:
+            return "missing"
+        if ActionCheck.unfollowed(label):
+            return "already"
+        try:
+            self.confirm_unfollow(driver)
+        except TimeoutException:
+            # Some accounts unfollow without asking; the button tells.
+            pass
+        return ActionCheck(driver, self.clock).verify(rows.scroll_box, user)
+
+    def unfollow_from_profile(self, driver, user, prefetcher=None):
+        if not (prefetcher and prefetcher.take(user)):
+            driver.get(f"{IG_BASE_URL}/{user}/")
+            self.clock.sleep(2)
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable(
+                    (
+                        By.XPATH,
+                        "//button[contains(text(),'Following') or contains(text(),'Mengikuti')]",
+                    )
+                )
+            ).click()
+        except TimeoutException:
+            state = ActionCheck(driver, self.clock).read()
+            if state.get("blocked"):
+                return "blocked"
+            # Offline target lists can name users unfollowed since.
+            if ActionCheck.unfollowed(state.get("label")):
+                return "already"
+            # The page answered but has no follow button at all.
+            if not state.get("label"):
+                return "not_found"
+            raise
+        try:
+            self.confirm_unfollow(driver)
+        except TimeoutException:
+            pass
+        return ActionCheck(driver, self.clock).verify()
+
+    def read_count(self, driver, list_type, timeout=10):
+        return self.read_shown_count(driver, list_type, timeout)[0]
+
+    def read_shown_count(self, driver, list_type, timeout=10):
+        # (count, exact). Prefer the exact number Instagram puts in a title
+        # attribute inside the link; fall back to the (possibly abbreviated)
+        # visible text.
+        link_xpath = f"//a[contains(@href,'/{list_type}')]"
+        link = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, link_xpath))
+        )
+        for element in driver.find_elements(By.XPATH, link_xpath + "//*[@title]"):
+            count = CountParser.parse(element.get_attribute("title"))
+            if count is not None:
+                return count, True
+        return CountParser.parse(link.text), False
+
+    def make_collector(self, driver, scroll_box, settings, list_type="following"):
+        if settings.get("COLLECT_MODE") == "network":
+            collector = NetworkCollector(
+                driver,
+                scroll_box,
+                list_type,
+                timeout=settings.get("OBSERVER_TIMEOUT", 4),
+                spill_bytes=int(settings.get("SET_SPILL_MB", 64) * 1024 * 1024),
+                clock=self.clock,
+            )
+        elif settings.get("COLLECT_MODE") == "observer":
+            collector = DialogHarvester(
+                driver, scroll_box, timeout=settings.get("OBSERVER_TIMEOUT", 4)
             )
-            settings = {
-                "MAX_SAFE_LIMIT": 150,
-                "BATCH_DELAY": 20,
-                "SLEEP_BETWEEN": [2, 5],
-                "SLEEP_AFTER_BATCH": 60,
-            }
         else:
-            with open(config_path, "r") as f:
-                settings = json.load(f)
+            collector = UserCollector(driver, scroll_box, clock=self.clock)
+        collector.metrics = self.metrics
+        collector.stall_limit = max(1, int(settings.get("STALL_LIMIT", 3)))
+        return collector.start()
+
+    def start_unfollow(self):
+        with self.run_metrics("unfollow_all"):
+            return self.run_unfollow_all()
+
+    def run_unfollow_all(self):
+        settings = self.load_settings()
         BATCH_DELAY = settings.get("BATCH_DELAY", 20)
         SLEEP_BETWEEN = tuple(settings.get("SLEEP_BETWEEN", [2, 5]))
         SLEEP_AFTER_BATCH = settings.get("SLEEP_AFTER_BATCH", 60)
         MAX_SAFE_LIMIT = settings.get("MAX_SAFE_LIMIT", 150)
         self.console.print("[yellow]🚀 Starting Instagram unfollow process...[/yellow]")
         try:
-            driver = self.get_chrome_driver()
+            driver = self.new_driver()
         except Exception as e:
             self.console.print(f"[red]❌ Failed to start ChromeDriver: {e}[/red]")
-            time.sleep(3)
+            self.clock.sleep(3)
             return
         self.console.print("[cyan]🌐 Opening Instagram login...[/cyan]")
-        driver.get("https://www.instagram.com/accounts/login/")
+        driver.get(f"{IG_BASE_URL}/accounts/login/")
         self.console.print(
             "[bold yellow]💬 Please log in manually in the browser window.[/bold yellow]"
         )
-        WebDriverWait(driver, 300).until(
-            lambda d: d.current_url and "/login" not in d.current_url
-        )
-        time.sleep(1.5)
-        username = self.console.prompt_choice(
-            "\n🔑 Enter your Instagram username (without @): "
+        with self.metrics.timed("login_wait"):
+            WebDriverWait(driver, 300).until(
+                lambda d: d.current_url and "/login" not in d.current_url
+            )
+        self.clock.sleep(1.5)
+        username = self.ask(
+            "username", "\n🔑 Enter your Instagram username (without @): "
         )
+        self.metrics.account = username
         if not username:
             self.console.print("[red]❌ Username cannot be empty.[/red]")
             driver.quit()
-            time.sleep(3)
+            self.clock.sleep(3)
             return
-        driver.get(f"https://www.instagram.com/{username}/")
-        try:
-            wait = WebDriverWait(driver, 10)
-            elem = wait.until(
-                EC.presence_of_element_located(
-                    (By.XPATH, "//header//a[contains(@href,'/following')]/span/span")
+        journal = UnfollowJournal(username)
+        queue = self.resume_journal(journal, "all")
+        if queue is False:
+            journal.close()
+            driver.quit()
+            return False
+        with self.metrics.timed("profile_nav", list="following"):
+            driver.get(f"{IG_BASE_URL}/{username}/")
+        total_following = None
+        if queue is None:
+            try:
+                total_following = self.read_count(driver, "following")
+            except Exception as e:
+                self.console.print(
+                    f"[red]❌ Failed to retrieve following count: {e}[/red]"
                 )
-            )
-            raw_count = elem.get_attribute("title") or elem.text
-            if not raw_count:
+                journal.close()
+                driver.quit()
+                return
+            if total_following is None:
                 self.console.print(
                     "[red]⚠️ Failed to fetch following count. Make sure your account is public and fully loaded.[/red]"
                 )
-                time.sleep(5)
+                self.clock.sleep(5)
+                journal.close()
                 driver.quit()
                 return
-
-            def parse_number(text):
-                text = text.lower().replace(",", "").strip()
-                return int(
-                    float(text.replace("k", "").replace("jt", ""))
-                    * (1000 if "k" in text else 1_000_000 if "jt" in text else 1)
-                )
-
-            total_following = parse_number(raw_count)
             self.console.print(
                 f"[green]📊 Detected following: {total_following}[/green]"
             )
-        except Exception as e:
-            self.console.print(f"[red]❌ Failed to retrieve following count: {e}[/red]")
-            driver.quit()
-            return
+        opened = self.clock.monotonic()
         try:
             WebDriverWait(driver, 20).until(
                 EC.element_to_be_clickable(
@@ -368,34 +2985,41 @@ class MainMenu:
                     )
                 )
             ).click()
-            time.sleep(3)
+            self.clock.sleep(3)
         except Exception as e:
             self.console.print(f"[red]❌ Could not open following list: {e}[/red]")
+            journal.close()
             driver.quit()
             return
-        self.console.print("[blue]📥 Fetching following list...[/blue]")
         scroll_box = WebDriverWait(driver, 30).until(
             EC.presence_of_element_located(
                 (By.XPATH, "//div[@role='dialog']//div[contains(@style, 'overflow')]")
             )
         )
-        last_height = 0
-        while True:
-            height = driver.execute_script(
-                "arguments[0].scrollTo(0, arguments[0].scrollHeight); return arguments[0].scrollHeight;",
-                scroll_box,
-            )
-            if height == last_height:
-                break
-            last_height = height
-            time.sleep(1)
-        clicked_buttons = set()
-        total_unfollowed = 0
-        try:
-            while total_unfollowed < total_following:
-                unfollowed = 0
-                remaining = total_following - total_unfollowed
-                UNFOLLOW_LIMIT = min(MAX_SAFE_LIMIT, remaining)
+        self.metrics.record(
+            "dialog_open", self.clock.monotonic() - opened, list="following"
+        )
+        window = None
+        if queue is None:
+            journal.plan("all", [], complete=False)
+        if not journal.complete:
+            # Rows are unfollowed as they load; the dialog is only scrolled
+            # further once the loaded ones are used up.
+            collector = self.make_collector(driver, scroll_box, settings, "following")
+            window = UnfollowWindow(journal, collector, total_following)
+        rows = DialogRows(driver, scroll_box)
+        scheduler = self.make_scheduler(username, settings)
+        breaker = self.make_breaker(settings)
+        try:
+            while journal.remaining() or (window and not window.done):
+                left = len(journal.remaining())
+                if window and not window.done:
+                    left = (
+                        max(left, total_following - len(journal.completed), 1)
+                        if total_following
+                        else MAX_SAFE_LIMIT
+                    )
+                UNFOLLOW_LIMIT = min(MAX_SAFE_LIMIT, left)
                 est_time = math.ceil(
                     (UNFOLLOW_LIMIT / BATCH_DELAY) * SLEEP_AFTER_BATCH
                     + UNFOLLOW_LIMIT * sum(SLEEP_BETWEEN) / 2
@@ -406,46 +3030,19 @@ class MainMenu:
                 self.console.print(
                     f"[cyan]⏱️ Estimated time: ~{est_time // 60} minutes[/cyan]"
                 )
-                for i, btn in enumerate(
-                    scroll_box.find_elements(By.XPATH, ".//button")
-                ):
-                    if unfollowed >= UNFOLLOW_LIMIT:
-                        break
-                    if i in clicked_buttons:
-                        continue
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                        time.sleep(1)
-                        btn.click()
-                        clicked_buttons.add(i)
-                        try:
-                            WebDriverWait(driver, 5).until(
-                                EC.element_to_be_clickable(
-                                    (
-                                        By.XPATH,
-                                        "//button[contains(text(), 'Unfollow') or contains(text(), 'Berhenti')]",
-                                    )
-                                )
-                            ).click()
-                        except:
-                            pass
-                        unfollowed += 1
-                        total_unfollowed += 1
-                        self.console.print(
-                            f"[green]{datetime.now().strftime('%H:%M:%S')} ✅ Unfollowed: {unfollowed}/{UNFOLLOW_LIMIT}[/green]"
-                        )
-                        time.sleep(random.uniform(*SLEEP_BETWEEN))
-
-                        if unfollowed % BATCH_DELAY == 0:
-                            self.console.print(
-                                "[yellow]⏸️ Cooling down for a minute...[/yellow]"
-                            )
-                            time.sleep(SLEEP_AFTER_BATCH)
-                    except Exception as e:
-                        self.console.print(f"[red]⚠️ Error during unfollow: {e}[/red]")
-                        time.sleep(2)
-                        continue
-                if total_unfollowed >= total_following:
+                self.unfollow_queue(
+                    driver,
+                    journal,
+                    rows,
+                    settings,
+                    UNFOLLOW_LIMIT,
+                    scheduler,
+                    window,
+                    breaker,
+                )
+                if scheduler.exhausted or breaker.stopped:
+                    break
+                if not journal.remaining() and (not window or window.done):
                     self.console.print(
                         "[green]✅ All followings have been unfollowed.[/green]"
                     )
@@ -454,8 +3051,9 @@ class MainMenu:
                     "\n[bold red]⚠️ WARNING: Continuing to unfollow in large batches may lead to account restrictions or temporary ban by Instagram![/bold red]"
                 )
                 answer = (
-                    input(
-                        "\n❓ Do you want to continue with the next 150 unfollows? (y/n): "
+                    self.read_line(
+                        f"\n❓ Do you want to continue with the next {MAX_SAFE_LIMIT} unfollows? (y/n): ",
+                        "confirm",
                     )
                     .strip()
                     .lower()
@@ -467,216 +3065,389 @@ class MainMenu:
                     break
         except KeyboardInterrupt:
             self.console.print("[red]🛑 Interrupted by user![/red]")
+            return False
         finally:
+            if window:
+                self.metrics.count("users_collected", window.loaded)
+            journal.close()
             self.console.print("[bold green]🎉 Unfollow process complete![/bold green]")
             driver.quit()
+        return not breaker.stopped
 
     def unfollow_non_followers(self):
-        config_path = "settings.json"
-        default_settings = {
-            "MAX_SAFE_LIMIT": 150,
-            "BATCH_DELAY": 20,
-            "SLEEP_BETWEEN": [2, 5],
-            "SLEEP_AFTER_BATCH": 60,
-        }
-        if not os.path.exists(config_path):
-            self.console.print(
-                "[yellow]⚠️ No settings file found. Using default values.[/yellow]"
-            )
-            settings = default_settings
-        else:
-            with open(config_path, "r") as f:
-                settings = json.load(f)
-        BATCH_DELAY = settings.get("BATCH_DELAY", 20)
-        SLEEP_BETWEEN = tuple(settings.get("SLEEP_BETWEEN", [2, 5]))
-        SLEEP_AFTER_BATCH = settings.get("SLEEP_AFTER_BATCH", 60)
+        with self.run_metrics("unfollow_non_followers"):
+            return self.run_unfollow_non_followers()
+
+    def run_unfollow_non_followers(self):
+        settings = self.load_settings()
         MAX_SAFE_LIMIT = settings.get("MAX_SAFE_LIMIT", 150)
         self.console.print(
             "[yellow]🚀 Starting Non-Follower Unfollow process...[/yellow]"
         )
         try:
-            driver = self.get_chrome_driver()
+            driver = self.new_driver()
         except Exception as e:
             self.console.print(f"[red]❌ ChromeDriver error: {e}[/red]")
             return
-        driver.get("https://www.instagram.com/accounts/login/")
+        driver.get(f"{IG_BASE_URL}/accounts/login/")
         self.console.print("[bold yellow]💬 Please log in manually...[/bold yellow]")
-        WebDriverWait(driver, 300).until(
-            lambda d: d.current_url and "/login" not in d.current_url
+        with self.metrics.timed("login_wait"):
+            WebDriverWait(driver, 300).until(
+                lambda d: d.current_url and "/login" not in d.current_url
+            )
+        username = self.ask(
+            "username", "🔑 Enter your Instagram username (without @): "
+        )
+        self.metrics.account = username
+        if not username:
+            self.console.print("[red]❌ Username required.[/red]")
+            driver.quit()
+            return
+        journal = UnfollowJournal(username)
+        queue = self.resume_journal(journal, "non_followers")
+        if queue is False:
+            journal.close()
+            driver.quit()
+            return False
+        rows = None
+        if queue is None:
+            queue = self.use_target_list(journal, username)
+        if queue is None:
+            parallel = min(int(settings.get("PARALLEL_SCANS", 1)), 2) > 1
+            if parallel and not settings.get("BROWSER_DAEMON"):
+                self.console.print(
+                    "[yellow]⚠️ PARALLEL_SCANS needs BROWSER_DAEMON. Scanning one list at a time.[/yellow]"
+                )
+                parallel = False
+            if parallel:
+                self.console.print(
+                    "[blue]📥 Fetching followers and following...[/blue]"
+                )
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                    pending = pool.submit(
+                        self.collect_in_new_session, username, "followers", settings
+                    )
+                    following, scroll_box = self.collect_list(
+                        driver, username, "following", settings
+                    )
+                    try:
+                        followers = pending.result()
+                    except Exception as e:
+                        self.console.print(
+                            f"[red]❌ Parallel followers scan failed: {e}[/red]"
+                        )
+                        followers = None
+            else:
+                followers, _ = self.collect_list(
+                    driver, username, "followers", settings
+                )
+                following, scroll_box = (
+                    self.collect_list(driver, username, "following", settings)
+                    if followers is not None
+                    else (None, None)
+                )
+            if followers is None or following is None:
+                journal.close()
+                driver.quit()
+                return
+            self.console.print(f"[green]✅ Total followers: {len(followers)}[/green]")
+            self.console.print(f"[green]✅ Total following: {len(following)}[/green]")
+            non_followers = list(following.difference(followers))
+            followers.close()
+            following.close()
+            self.console.print(
+                f"[magenta]👤 Non-followers to unfollow: {len(non_followers)}[/magenta]"
+            )
+            journal.plan("non_followers", non_followers)
+            if settings.get("UNFOLLOW_IN_DIALOG"):
+                rows = DialogRows(driver, scroll_box)
+        scheduler = self.make_scheduler(username, settings)
+        breaker = self.make_breaker(settings)
+        try:
+            self.unfollow_queue(
+                driver,
+                journal,
+                rows,
+                settings,
+                MAX_SAFE_LIMIT,
+                scheduler,
+                breaker=breaker,
+            )
+            if journal.remaining() and not (scheduler.exhausted or breaker.stopped):
+                self.console.print(
+                    f"[yellow]🚫 Reached safe unfollow limit. {len(journal.remaining())} left for the next run.[/yellow]"
+                )
+        finally:
+            journal.close()
+        self.console.print(
+            "[bold green]🎉 Done! Non-followers have been unfollowed.[/bold green]"
+        )
+        driver.quit()
+        return not breaker.stopped
+
+    def use_target_list(self, journal, username):
+        targets = TargetList(username)
+        saved = targets.load()
+        if not saved:
+            return None
+        answer = self.ask(
+            "confirm",
+            f"\n🎯 Offline target list from {saved['created_at']} ({len(saved['users'])} users). Use it and skip scanning? (y/n): ",
+            choices=["y", "n"],
         )
-        username = self.console.prompt_choice(
-            "🔑 Enter your Instagram username (without @): "
+        if answer.lower() != "y":
+            return None
+        journal.plan("non_followers", saved["users"])
+        targets.discard()
+        self.console.print(
+            f"[magenta]👤 Non-followers to unfollow: {len(saved['users'])}[/magenta]"
         )
+        return journal.remaining()
+
+    def diff_sources(self, store, account, list_type, spill_bytes):
+        # One source per scan, newest first: (finished at, label, loader).
+        # An export and the snapshot saved by the same scan count once, so
+        # "previous" is always an older scan. Scans that may be partial are
+        # skipped: a short followers list would turn followers into targets.
+        scans = {}
+        skipped = []
+        for snapshot_id, taken_at, total, expected, exact in store.history(
+            account, list_type, SnapshotStore.KEEP
+        ):
+            label = f"snapshot #{snapshot_id} ({total} users)"
+            short = ExportWriter.shortfall(total, expected, bool(exact))
+            if short:
+                skipped.append(f"{label}: {short} users")
+                continue
+            scans[("snapshot", snapshot_id)] = (
+                taken_at,
+                label,
+                lambda snapshot_id=snapshot_id: UsernameSet(
+                    store.users(snapshot_id), spill_bytes
+                ),
+            )
+        if os.path.isdir("exports"):
+            for name in os.listdir("exports"):
+                info = ExportReader.describe(name)
+                if (
+                    not info
+                    or info["account"].lower() != account.lower()
+                    or info["list_type"] != list_type
+                ):
+                    continue
+                path = os.path.join("exports", name)
+                problem = ExportWriter.problem(path)
+                if problem:
+                    skipped.append(f"{path}: {problem}")
+                    continue
+                marker = ExportWriter.read_marker(path)
+                key = ("snapshot", marker.get("snapshot_id"))
+                if key in scans:
+                    continue
+                scans[key if marker.get("snapshot_id") else ("file", path)] = (
+                    marker["finished_at"],
+                    path,
+                    lambda path=path: ExportReader.load(path, spill_bytes),
+                )
+        for reason in skipped:
+            self.console.print(
+                f"[yellow]⚠️ Skipped {list_type} source {reason}[/yellow]"
+            )
+        return sorted(scans.values(), key=lambda source: source[0], reverse=True)
+
+    def offline_diff(self):
+        with self.run_metrics("offline_diff"):
+            store = SnapshotStore()
+            try:
+                ok = self.run_offline_diff(store)
+            finally:
+                store.close()
+        self.read_line("\n[Press Enter to return to menu...]")
+        return ok
+
+    def run_offline_diff(self, store):
+        settings = self.load_settings(announce=False)
+        spill_bytes = int(settings.get("SET_SPILL_MB", 64) * 1024 * 1024)
+        username = self.ask(
+            "username", "🔑 Instagram username of the exports (without @): "
+        ).strip()
+        self.metrics.account = username
         if not username:
-            self.console.print("[red]❌ Username required.[/red]")
-            driver.quit()
+            self.console.print("[red]❌ Username is required.[/red]")
+            return
+        followers_sources = self.diff_sources(store, username, "followers", spill_bytes)
+        following_sources = self.diff_sources(store, username, "following", spill_bytes)
+        chosen = {
+            "followers": followers_sources[0] if followers_sources else None,
+            "following": following_sources[0] if following_sources else None,
+            "previous": followers_sources[1] if len(followers_sources) > 1 else None,
+        }
+        for role, source in chosen.items():
+            if source:
+                self.console.print(f"[cyan]📂 {role}: {source[1]} ({source[0]})[/cyan]")
+        answer = self.ask(
+            "sources",
+            "\n❓ Use these sources? (y = yes / n = enter file paths): ",
+            choices=["y", "n"],
+        )
+        if answer.lower() == "n":
+            for role in chosen:
+                path = self.ask(
+                    role,
+                    f"📂 {role} file{' (blank to skip)' if role == 'previous' else ''}: ",
+                ).strip()
+                if not path:
+                    chosen[role] = None
+                elif not os.path.exists(path):
+                    self.console.print(f"[red]❌ File not found: {path}[/red]")
+                    return
+                else:
+                    problem = ExportWriter.problem(path)
+                    if problem:
+                        self.console.print(
+                            f"[bold yellow]⚠️ {path}: {problem}. Check the results before unfollowing.[/bold yellow]"
+                        )
+                    chosen[role] = (
+                        path,
+                        path,
+                        lambda path=path: ExportReader.load(path, spill_bytes),
+                    )
+        if not chosen["followers"] or not chosen["following"]:
+            self.console.print(
+                f"[red]❌ Need a followers and a following export or snapshot for @{username}. Use option 3 first.[/red]"
+            )
             return
-        driver.get(f"https://www.instagram.com/{username}/")
+        lists = {}
         try:
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, "//a[contains(@href, '/followers')]")
-                )
-            ).click()
-            time.sleep(2)
+            for role, source in chosen.items():
+                if source:
+                    with self.metrics.timed("load", source=source[1]) as event:
+                        lists[role] = source[2]()
+                        event["users"] = len(lists[role])
         except Exception as e:
-            self.console.print(f"[red]❌ Failed to open followers: {e}[/red]")
-            driver.quit()
+            self.console.print(f"[red]❌ Could not read {source[1]}: {e}[/red]")
+            for users in lists.values():
+                users.close()
             return
-        self.console.print("[blue]📥 Fetching followers...[/blue]")
+        diff = FollowDiff(lists["followers"], lists["following"], lists.get("previous"))
+        directory = os.path.join(
+            "exports", f"{username}_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
         try:
-            scroll_box = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located(
-                    (
-                        By.XPATH,
-                        "//div[@role='dialog']//div[contains(@style, 'overflow')]",
-                    )
+            with self.metrics.timed("diff"):
+                counts = diff.write(directory)
+                TargetList(username).save(
+                    diff.non_followers(),
+                    [source[1] for source in chosen.values() if source],
                 )
-            )
-        except:
-            self.console.print("[red]❌ Timeout opening followers list.[/red]")
-            driver.quit()
-            return
-        followers = set()
-        last_height = 0
-        while True:
-            links = scroll_box.find_elements(By.TAG_NAME, "a")
-            for link in links:
-                href = link.get_attribute("href")
-                if href and "instagram.com" in href:
-                    uname = href.rstrip("/").split("/")[-1]
-                    followers.add(uname)
-            height = driver.execute_script(
-                "arguments[0].scrollTo(0, arguments[0].scrollHeight); return arguments[0].scrollHeight;",
-                scroll_box,
-            )
-            if height == last_height:
-                break
-            last_height = height
-            time.sleep(1)
+        finally:
+            for users in lists.values():
+                users.close()
+        labels = {
+            "non_followers": "👤 Non-followers",
+            "fans": "🙋 Followers you don't follow back",
+            "mutuals": "🤝 Mutuals",
+            "new_followers": "🆕 New followers",
+            "lost_followers": "👋 Lost followers",
+        }
+        for report, count in counts.items():
+            self.console.print(f"[green]{labels[report]}: {count}[/green]")
+        self.console.print(f"[green][✓] Reports saved to {directory}[/green]")
+        self.console.print(
+            "[magenta]🎯 Non-followers saved as the target list; option 2 can use it without scanning.[/magenta]"
+        )
+        return True
+
+    def collect_lists(self):
+        with self.run_metrics("collect"):
+            ok = self.run_collect()
+        self.read_line("\n[Press Enter to return to menu...]")
+        return ok
 
-        self.console.print(f"[green]✅ Total followers: {len(followers)}[/green]")
-        driver.get(f"https://www.instagram.com/{username}/")
+    def run_collect(self):
+        # Scans lists into the snapshot store only, for Offline Diff or a
+        # later incremental scan.
+        settings = self.load_settings()
         try:
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, "//a[contains(@href, '/following')]")
-                )
-            ).click()
-            time.sleep(2)
+            driver = self.new_driver()
         except Exception as e:
-            self.console.print(f"[red]❌ Failed to open following: {e}[/red]")
-            driver.quit()
+            self.console.print(f"[red]❌ ChromeDriver error: {e}[/red]")
             return
-        self.console.print("[blue]📥 Fetching following...[/blue]")
         try:
-            scroll_box = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located(
-                    (
-                        By.XPATH,
-                        "//div[@role='dialog']//div[contains(@style, 'overflow')]",
-                    )
-                )
-            )
-        except:
-            self.console.print("[red]❌ Timeout opening following list.[/red]")
-            driver.quit()
-            return
-        following = set()
-        last_height = 0
-        while True:
-            links = scroll_box.find_elements(By.TAG_NAME, "a")
-            for link in links:
-                href = link.get_attribute("href")
-                if href and "instagram.com" in href:
-                    uname = href.rstrip("/").split("/")[-1]
-                    following.add(uname)
-            height = driver.execute_script(
-                "arguments[0].scrollTo(0, arguments[0].scrollHeight); return arguments[0].scrollHeight;",
-                scroll_box,
+            driver.get(f"{IG_BASE_URL}/accounts/login/")
+            self.console.print(
+                "[bold yellow]💬 Please log in manually...[/bold yellow]"
             )
-            if height == last_height:
-                break
-            last_height = height
-            time.sleep(1)
-        self.console.print(f"[green]✅ Total following: {len(following)}[/green]")
-        non_followers = [user for user in following if user not in followers]
-        self.console.print(
-            f"[magenta]👤 Non-followers to unfollow: {len(non_followers)}[/magenta]"
-        )
-        unfollowed = 0
-        for i, user in enumerate(non_followers):
-            if unfollowed >= MAX_SAFE_LIMIT:
-                self.console.print("[yellow]🚫 Reached safe unfollow limit.[/yellow]")
-                break
-            try:
-                driver.get(f"https://www.instagram.com/{user}/")
-                time.sleep(2)
-                btn = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//button[contains(text(),'Following') or contains(text(),'Mengikuti')]",
-                        )
-                    )
+            with self.metrics.timed("login_wait"):
+                WebDriverWait(driver, 300).until(
+                    lambda d: d.current_url and "/login" not in d.current_url
                 )
-                btn.click()
-                confirm_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//button[contains(text(),'Unfollow') or contains(text(),'Berhenti')]",
-                        )
-                    )
+            username = self.ask(
+                "username", "🔑 Enter your Instagram username (without @): "
+            ).strip()
+            self.metrics.account = username
+            if not username:
+                self.console.print("[red]❌ Username is required.[/red]")
+                return
+            choice = (
+                self.ask(
+                    "list_type",
+                    "📥 Collect (followers) (following) or (both) ? ",
+                    choices=["followers", "following", "both"],
                 )
-                confirm_btn.click()
-                unfollowed += 1
+                .lower()
+                .strip()
+            )
+            if choice not in ["followers", "following", "both"]:
                 self.console.print(
-                    f"[green]{datetime.now().strftime('%H:%M:%S')} ✅ Unfollowed @{user} ({unfollowed}/{MAX_SAFE_LIMIT})[/green]"
+                    "[red]❌ Invalid input. Please enter 'followers', 'following' or 'both'.[/red]"
                 )
-                time.sleep(random.uniform(*SLEEP_BETWEEN))
-                if unfollowed % BATCH_DELAY == 0:
-                    self.console.print("[yellow]⏸️ Cooling down...[/yellow]")
-                    time.sleep(SLEEP_AFTER_BATCH)
-            except Exception as e:
-                self.console.print(f"[red]⚠️ Failed to unfollow @{user}: {e}[/red]")
-                continue
-        self.console.print(
-            "[bold green]🎉 Done! Non-followers have been unfollowed.[/bold green]"
-        )
-        driver.quit()
+                return
+            for list_type in (
+                ["followers", "following"] if choice == "both" else [choice]
+            ):
+                users, _ = self.collect_list(driver, username, list_type, settings)
+                if users is None:
+                    return
+                self.console.print(f"[green]✅ Total {list_type}: {len(users)}[/green]")
+                users.close()
+            self.console.print(
+                "[green][✓] Snapshots saved. Use Offline Diff to compare them.[/green]"
+            )
+            return True
+        finally:
+            driver.quit()
 
     def export_follow_data(self):
+        with self.run_metrics("export"):
+            return self.run_export()
+
+    def run_export(self):
+        settings = self.load_settings(announce=False)
+        scan_info = {}
+
         def scroll_and_collect(
-            driver, console, wait_time=0.75, max_scrolls=2000, mode="followers"
+            driver,
+            console,
+            wait_time=0.75,
+            max_scrolls=None,
+            mode="followers",
+            account="",
+            writer=None,
         ):
             users = set()
             actions = ActionChains(driver)
             try:
-                xpath = (
-                    "//a[contains(@href,'/followers')]/span"
-                    if mode == "followers"
-                    else "//a[contains(@href,'/following')]/span"
-                )
-                count_element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                count_text = count_element.get_attribute("title") or count_element.text
-                count_text = (
-                    count_text.lower().replace(",", "").replace(".", "").strip()
-                )
-                match = re.search(r"\d+", count_text)
-                if match:
-                    total_users = int(match.group())
-                    console.print(f"[green]📊 Total {mode}: {total_users}[/green]")
-                else:
-                    console.print(
-                        f"[red]❌ Failed to detect total {mode} from: '{count_text}'[/red]"
-                    )
-                    return users
+                total_users, exact = self.read_shown_count(driver, mode)
             except Exception as e:
                 console.print(f"[red]❌ Failed to get {mode} count: {e}[/red]")
                 return users
+            if total_users is None:
+                console.print(
+                    f"[yellow]⚠️ Could not read the {mode} count. Collecting until the list stops growing.[/yellow]"
+                )
+            else:
+                console.print(f"[green]📊 Total {mode}: {total_users}[/green]")
             try:
                 dialog = WebDriverWait(driver, 100).until(
                     EC.presence_of_element_located(
@@ -690,36 +3461,60 @@ class MainMenu:
                 console.print(f"[red]❌ {mode} dialog not found.[/red]")
                 return users
             console.print(f"\n[cyan][~] Collecting {mode} data...[/cyan]")
-            for _ in range(7):
-                actions.send_keys(Keys.TAB)
-            actions.send_keys(Keys.PAGE_DOWN).perform()
-            time.sleep(wait_time)
-            last_count = 0
-            for _ in range(max_scrolls):
-                links = dialog.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    href = link.get_attribute("href")
-                    if href and "instagram.com" in href:
-                        username = href.rstrip("/").split("/")[-1]
-                        users.add(username)
-                if len(users) > last_count:
-                    console.print(
-                        f"    → Collected: {len(users)} of {total_users} users..."
-                    )
-                    last_count = len(users)
-                if len(users) >= total_users:
-                    break
+            keyboard = settings.get("COLLECT_MODE") == "dom"
+            if keyboard:
+                for _ in range(7):
+                    actions.send_keys(Keys.TAB)
                 actions.send_keys(Keys.PAGE_DOWN).perform()
-                time.sleep(wait_time)
-            actions.send_keys(Keys.END).perform()
-            time.sleep(1.5)
-            links = dialog.find_elements(By.TAG_NAME, "a")
-            for link in links:
-                href = link.get_attribute("href")
-                if href and "instagram.com" in href:
-                    username = href.rstrip("/").split("/")[-1]
-                    users.add(username)
-            if len(users) >= total_users:
+                self.clock.sleep(wait_time)
+            last_count = 0
+            last_height = 0
+            scan = self.start_scan(account, mode, settings)
+            users = scan.seen
+            collector = self.make_collector(driver, dialog, settings, mode)
+            with self.dashboard.task(f"Collecting {mode}", total_users) as task:
+                for _ in range(max_scrolls) if max_scrolls else itertools.count():
+                    with self.metrics.timed("collect") as event:
+                        batch = collector.collect()
+                        event["users"] = len(batch)
+                    stopped = scan.add(batch)
+                    if writer:
+                        writer.add(scan.fresh)
+                    if stopped:
+                        break
+                    if len(users) > last_count:
+                        self.dashboard.update(task, completed=len(users))
+                        last_count = len(users)
+                    if total_users and len(users) >= total_users:
+                        break
+                    with self.metrics.timed("scroll"):
+                        if keyboard:
+                            actions.send_keys(Keys.PAGE_DOWN).perform()
+                            self.clock.sleep(wait_time)
+                            height = collector.height()
+                        else:
+                            height = collector.advance()
+                    if collector.finished(len(batch), height, last_height):
+                        break
+                    last_height = height
+            if keyboard and not scan.stopped:
+                actions.send_keys(Keys.END).perform()
+                self.clock.sleep(1.5)
+            if not scan.stopped:
+                scan.add(collector.collect())
+                if writer:
+                    writer.add(scan.fresh)
+            collector.stop()
+            users = self.save_snapshot(account, mode, scan, total_users, exact)
+            scan_info.update(
+                expected=total_users, exact=exact, snapshot_id=scan.snapshot_id
+            )
+            if writer:
+                writer.add(users.iter_from(scan.tail_start))
+            self.metrics.count("users_collected", len(users))
+            if total_users is None:
+                console.print(f"\n[green][✓] Collected {len(users)} {mode}.[/green]")
+            elif len(users) >= total_users:
                 console.print(f"\n[green][✓] All {mode} collected![/green]")
             else:
                 console.print(
@@ -728,27 +3523,31 @@ class MainMenu:
             return users
 
         try:
-            driver = self.get_chrome_driver()
+            driver = self.new_driver()
         except Exception as e:
             self.console.print(f"[red]❌ ChromeDriver error: {e}[/red]")
             return
+        writer = None
         try:
-            driver.get("https://www.instagram.com/accounts/login/")
+            driver.get(f"{IG_BASE_URL}/accounts/login/")
             self.console.print(
                 "[bold yellow]💬 Please log in manually...[/bold yellow]"
             )
-            WebDriverWait(driver, 100).until(
-                lambda d: d.current_url and "/login" not in d.current_url
-            )
-            username = self.console.prompt_choice(
-                "🔑 Enter your Instagram username (without @): "
+            with self.metrics.timed("login_wait"):
+                WebDriverWait(driver, 100).until(
+                    lambda d: d.current_url and "/login" not in d.current_url
+                )
+            username = self.ask(
+                "username", "🔑 Enter your Instagram username (without @): "
             ).strip()
+            self.metrics.account = username
             if not username:
                 self.console.print("[red]❌ Username is required.[/red]")
-                time.sleep(3)
+                self.clock.sleep(3)
                 return
             data_type = (
-                self.console.prompt_choice(
+                self.ask(
+                    "list_type",
                     "📤 Export (followers) or (following) ? ",
                     choices=["followers", "following"],
                 )
@@ -760,51 +3559,87 @@ class MainMenu:
                     "[red]❌ Invalid input. Please enter 'followers' or 'following'.[/red]"
                 )
                 driver.quit()
-                time.sleep(3)
+                self.clock.sleep(3)
                 return
             export_format = (
-                self.console.prompt_choice(
-                    "💾 Format (csv / xlsx / json / txt) ? ",
-                    choices=["csv", "xlsx", "json", "txt"],
+                self.ask(
+                    "format",
+                    "💾 Format (csv / xlsx / json / jsonl / txt) ? ",
+                    choices=["csv", "xlsx", "json", "jsonl", "txt"],
                 )
                 .lower()
                 .strip()
             )
-            if export_format not in ["csv", "xlsx", "json", "txt"]:
+            if export_format not in ["csv", "xlsx", "json", "jsonl", "txt"]:
                 self.console.print(
-                    "[red]❌ Invalid format. Choose from csv, xlsx, json, or txt.[/red]"
+                    "[red]❌ Invalid format. Choose from csv, xlsx, json, jsonl, or txt.[/red]"
                 )
                 driver.quit()
-                time.sleep(3)
+                self.clock.sleep(3)
                 return
             os.makedirs("exports", exist_ok=True)
-            driver.get(f"https://www.instagram.com/{username}/")
-            time.sleep(2)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base_filename = f"{username}_{data_type}_{timestamp}"
+            filepath = os.path.join("exports", f"{base_filename}.{export_format}")
+            if (
+                settings.get("STREAM_EXPORT", True)
+                and export_format in ExportWriter.FORMATS
+            ):
+                writer = ExportWriter(
+                    filepath, export_format, settings.get("EXPORT_FLUSH_EVERY", 500)
+                )
+            with self.metrics.timed("profile_nav", list=data_type):
+                driver.get(f"{IG_BASE_URL}/{username}/")
+                self.clock.sleep(2)
             self.console.print(f"\n[blue]📥 Opening {data_type} list...[/blue]")
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable(
-                        (By.XPATH, f"//a[contains(@href, '/{data_type}')]")
-                    )
-                ).click()
-                time.sleep(2)
+                with self.metrics.timed("dialog_open", list=data_type):
+                    WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable(
+                            (By.XPATH, f"//a[contains(@href, '/{data_type}')]")
+                        )
+                    ).click()
+                    self.clock.sleep(2)
             except Exception as e:
                 self.console.print(
                     f"[red]❌ Failed to open {data_type} list: {e}[/red]"
                 )
                 return
             self.console.print("[cyan]🔄 Collecting data...[/cyan]")
-            users = scroll_and_collect(driver, self.console, mode=data_type)
+            users = scroll_and_collect(
+                driver, self.console, mode=data_type, account=username, writer=writer
+            )
             if not users:
                 self.console.print(
                     f"[red]⚠️ No {data_type} found or failed to collect.[/red]"
                 )
+                if writer:
+                    writer.close()
+                    os.remove(filepath)
                 return
+            if writer:
+                try:
+                    if settings.get("EXPORT_SORT", True):
+                        self.console.print("[cyan]🔃 Sorting export...[/cyan]")
+                    count = writer.finish(sort=settings.get("EXPORT_SORT", True))
+                except Exception as e:
+                    self.console.print(
+                        f"[red]❌ Error finishing export (unsorted rows are kept in {filepath}): {e}[/red]"
+                    )
+                    return
+                ExportWriter.mark_complete(
+                    filepath,
+                    count,
+                    scan_info.get("expected"),
+                    scan_info.get("snapshot_id"),
+                    scan_info.get("exact", False),
+                )
+                self.console.print(
+                    f"[green][✓] Exported {count} {data_type} to {filepath}[/green]"
+                )
+                return True
 
             df = pd.DataFrame(sorted(users), columns=["username"])
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_filename = f"{username}_{data_type}_{timestamp}"
-            filepath = os.path.join("exports", f"{base_filename}.{export_format}")
             try:
                 if export_format == "csv":
                     df.to_csv(filepath, index=False, encoding="utf-8-sig")
@@ -812,6 +3647,8 @@ class MainMenu:
                     df.to_excel(filepath, index=False)
                 elif export_format == "json":
                     df.to_json(filepath, orient="records", indent=2)
+                elif export_format == "jsonl":
+                    df.to_json(filepath, orient="records", lines=True)
                 elif export_format == "txt":
                     with open(filepath, "w", encoding="utf-8") as f:
                         for user in df["username"]:
@@ -819,34 +3656,37 @@ class MainMenu:
             except Exception as e:
                 self.console.print(f"[red]❌ Error saving file: {e}[/red]")
                 return
+            ExportWriter.mark_complete(
+                filepath,
+                len(df),
+                scan_info.get("expected"),
+                scan_info.get("snapshot_id"),
+                scan_info.get("exact", False),
+            )
             self.console.print(
                 f"[green][✓] Exported {len(df)} {data_type} to {filepath}[/green]"
             )
+            return True
         except Exception as e:
             self.console.print(f"[red]❌ Unexpected error: {e}[/red]")
         finally:
+            if writer:
+                writer.close()
             driver.quit()
-            input("\n[Press Enter to return to menu...]")
+            self.read_line("\n[Press Enter to return to menu...]")
 
     def check_dependencies(self):
         self.console.print("\n[cyan]>> Rechecking dependencies...[/cyan]")
-        self.system.setup_environment()
-        self.deps.check_and_install()
-        self.system.deps_ready = True
-
-        deps_dir = ".meta"
-        os.makedirs(deps_dir, exist_ok=True)
-
+        # System packages are only touched when pip itself is missing.
+        if self.deps.missing() and self.deps.locate("pip") is None:
+            self.system.setup_environment()
         try:
-            flag_file = os.path.join(deps_dir, "deps_checked.flag")
-            if os.path.exists(flag_file):
-                os.remove(flag_file)
-            with open(flag_file, "w") as f:
-                f.write("Dependencies checked and ready.\n")
-        except Exception as e:
-            self.console.print(f"[red]❌ Error writing deps_checked flag: {e}[/red]")
-            self.logger.error(f"Failed to write deps_checked flag: {e}")
+            self.deps.check_and_install()
+        except OSError as e:
+            self.console.print(f"[red]❌ Error saving dependency check: {e}[/red]")
+            self.logger.error(f"Failed to save dependency check: {e}")
             return
+        self.system.deps_ready = True
 
         self.console.print("\n[green][✓] Dependencies OK![/green]")
         self.console.print("\n[bold bright_white][ PRESS ENTER ][/bold bright_white]")
@@ -854,45 +3694,81 @@ class MainMenu:
 
     def settings_menu(self):
         config_path = "settings.json"
-        default_config = {
-            "MAX_SAFE_LIMIT": 150,
-            "BATCH_DELAY": 20,
-            "SLEEP_BETWEEN": [2, 5],
-            "SLEEP_AFTER_BATCH": 60,
-        }
-        if not os.path.exists(config_path):
-            with open(config_path, "w") as f:
-                json.dump(default_config, f, indent=4)
-        with open(config_path, "r") as f:
-            settings = json.load(f)
-        self.console.print(
-            "\n[bold bright_white]⚙️ Current Settings:[/bold bright_white]"
-        )
-        for key, val in settings.items():
-            self.console.print(f"[cyan]- {key}: [white]{val}[/white][/cyan]")
-        self.console.print(
-            "\n[bold green]You can press Enter to skip and keep current values.[/bold green]"
-        )
-        for key in settings:
-            user_input = self.console.prompt_choice(
-                f"Set value for [yellow]{key}[/yellow] (current: {settings[key]}): "
+        settings = self.load_settings(announce=False)
+        keys = list(settings)
+        changed = False
+        while True:
+            self.console.print(
+                "\n[bold bright_white]⚙️ Current Settings:[/bold bright_white]"
             )
-            if user_input.strip():
-                try:
-                    if key == "SLEEP_BETWEEN":
-                        settings[key] = [int(i) for i in user_input.strip().split(",")]
-                    else:
-                        settings[key] = int(user_input)
-                except ValueError:
-                    self.console.print(
-                        f"[red]❌ Invalid input for {key}. Keeping current value.[/red]"
-                    )
-        with open(config_path, "w") as f:
-            json.dump(settings, f, indent=4)
-
-        self.console.print("\n[green][✓] Settings updated successfully![/green]")
+            for number, key in enumerate(keys, 1):
+                marker = "" if settings[key] == DEFAULT_SETTINGS.get(key) else " *"
+                self.console.print(
+                    f"[cyan]{number:>2}. {key}: [white]{settings[key]}[/white]{marker}[/cyan]"
+                )
+            choice = self.console.prompt_choice(
+                "\n[bold green]Setting to change (number or name, Enter to finish): [/bold green]"
+            ).strip()
+            if not choice:
+                break
+            if choice.isdigit() and 1 <= int(choice) <= len(keys):
+                key = keys[int(choice) - 1]
+            elif choice.upper() in settings:
+                key = choice.upper()
+            else:
+                self.console.print(f"[red]❌ Unknown setting: {choice}[/red]")
+                continue
+            hint = (
+                f" [{'/'.join(SETTING_CHOICES[key])}]" if key in SETTING_CHOICES else ""
+            )
+            user_input = self.console.prompt_choice(
+                f"Set value for [yellow]{key}[/yellow]{hint} (current: {settings[key]}, default: {DEFAULT_SETTINGS.get(key)}): "
+            ).strip()
+            if not user_input:
+                continue
+            try:
+                settings[key] = self.parse_setting(key, user_input)
+                changed = True
+            except ValueError:
+                self.console.print(
+                    f"[red]❌ Invalid input for {key}. Keeping current value.[/red]"
+                )
+        if changed:
+            # Only values that differ from the defaults are saved, so later
+            # versions can change the defaults of everything else.
+            with open(config_path, "w") as f:
+                json.dump(
+                    {
+                        key: value
+                        for key, value in settings.items()
+                        if key not in DEFAULT_SETTINGS or value != DEFAULT_SETTINGS[key]
+                    },
+                    f,
+                    indent=4,
+                )
+            self.console.print("\n[green][✓] Settings updated successfully![/green]")
+        else:
+            self.console.print("\n[yellow]No settings changed.[/yellow]")
         input("\nPress Enter to return to menu...")
 
+    def parse_setting(self, key, value):
+        default = DEFAULT_SETTINGS.get(key)
+        if key in SETTING_CHOICES:
+            if value.lower() not in SETTING_CHOICES[key]:
+                raise ValueError(value)
+            return value.lower()
+        if isinstance(default, list):
+            return [int(i) for i in value.split(",")]
+        if isinstance(default, bool):
+            if value.lower() not in ["y", "n", "true", "false", "1", "0"]:
+                raise ValueError(value)
+            return value.lower() in ["y", "true", "1"]
+        if isinstance(default, float):
+            return float(value)
+        if isinstance(default, str):
+            return value
+        return int(value)
+
     def exit_program(self):
         self.cmd.clear_screen()
         self.console.print("[magenta]👋 Exiting. Goodbye![/magenta]\n")
@@ -900,18 +3776,19 @@ class MainMenu:
 
 
 class SystemSetup:
-    def __init__(self):
+    def __init__(self, log_file="ig_cleaner.log"):
         self.console = ConsoleHelper()
         self.logo = LogoPrinter(self.console.console)
-        self.logger = LoggerManager("ig_cleaner.log").logger
+        self.log_manager = LoggerManager(log_file)
+        self.logger = self.log_manager.logger
         self.cmd = CommandRunner(self.console, self.logger)
         self.console.cmd = self.cmd
-        self.deps_ready = os.path.exists(os.path.join(".meta", "deps_checked.flag"))
         self.deps = DependencyInstaller(
             self.console,
             self.logger,
             ["selenium", "rich", "requests", "pandas", "openpyxl"],
         )
+        self.deps_ready = self.deps.ready()
 
     def log(self, msg, level="info", style=None):
         getattr(self.logger, level)(msg)
@@ -919,10 +3796,8 @@ class SystemSetup:
 
     def setup_environment(self):
         if not self.cmd.is_windows:
-            self.console.print("[cyan]🔧 Running apt update & upgrade...[/cyan]")
+            self.console.print("[cyan]🔧 Installing pip with apt...[/cyan]")
             self.cmd.run(["sudo", "apt", "update"])
-            self.cmd.run(["sudo", "apt", "full-upgrade", "-y"])
-            self.cmd.run(["sudo", "apt", "autoremove", "-y"])
             self.cmd.run(["sudo", "apt", "install", "python3-pip", "-y"])
         else:
             self.console.print("[yellow]⚠️ Skipping apt on Windows.[/yellow]")
@@ -939,9 +3814,368 @@ class SystemSetup:
                 self.console, self.logger, self.cmd, self.logo, self.deps, self
             ).show()
         finally:
-            LoggerManager().cleanup()
+            self.log_manager.cleanup()
 
 
-if __name__ == "__main__":
-    SystemSetup().run()
+class CommandLine:
+    # Non-interactive entry point for scheduled runs. Each subcommand runs
+    # the same MainMenu flow as the menu, with its prompts answered from
+    # the flags. Without a subcommand the interactive menu starts.
+    COMMANDS = {
+        "collect": "collect_lists",
+        "export": "export_follow_data",
+        "unfollow-all": "start_unfollow",
+        "unfollow-nonfollowers": "unfollow_non_followers",
+        "diff": "offline_diff",
+    }
+
+    def __init__(self, argv=None, settings=None, log_file="ig_cleaner.log"):
+        self.argv = sys.argv[1:] if argv is None else argv
+        self.args = self.parser().parse_args(self.argv)
+        self.settings = settings or {}
+        self.log_file = log_file
+        self.summary = None
+
+    @staticmethod
+    def parser():
+        parser = argparse.ArgumentParser(
+            prog="ig_cleaner.py",
+            description="IG-Cleaner. Run without a command for the interactive menu.",
+        )
+        options = argparse.ArgumentParser(add_help=False)
+        options.add_argument(
+            "-y",
+            "--yes",
+            action="store_true",
+            help="answer yes to confirmations (resume, target list, next batch)",
+        )
+        options.add_argument(
+            "--headless",
+            action="store_true",
+            help="lean Chrome, headless when a saved login exists",
+        )
+        options.add_argument(
+            "--set",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="override a settings.json value for this run",
+        )
+        common = argparse.ArgumentParser(add_help=False, parents=[options])
+        common.add_argument(
+            "-a", "--account", required=True, help="Instagram username (without @)"
+        )
+        commands = parser.add_subparsers(dest="command", metavar="command")
+        collect = commands.add_parser(
+            "collect", parents=[common], help="scan lists into snapshots"
+        )
+        collect.add_argument(
+            "--list", choices=["followers", "following", "both"], default="both"
+        )
+        export = commands.add_parser(
+            "export", parents=[common], help="export followers or following"
+        )
+        export.add_argument(
+            "--list", choices=["followers", "following"], default="followers"
+        )
+        export.add_argument(
+            "-f",
+            "--format",
+            choices=["csv", "xlsx", "json", "jsonl", "txt"],
+            default="csv",
+        )
+        for name, text in [
+            ("unfollow-all", "unfollow everyone you follow"),
+            ("unfollow-nonfollowers", "unfollow users who don't follow back"),
+        ]:
+            unfollow = commands.add_parser(name, parents=[common], help=text)
+            unfollow.add_argument(
+                "-l", "--limit", type=int, help="unfollows per batch (MAX_SAFE_LIMIT)"
+            )
+        diff = commands.add_parser(
+            "diff", parents=[common], help="compare exports/snapshots offline"
+        )
+        for role in ["followers", "following", "previous"]:
+            diff.add_argument(f"--{role}", metavar="FILE", default="")
+        accounts = commands.add_parser(
+            "run-accounts",
+            parents=[options],
+            help="run a command for every account in an accounts file",
+        )
+        accounts.add_argument("file", help="JSON list of accounts")
+        accounts.add_argument(
+            "-c",
+            "--command",
+            dest="default_command",
+            choices=list(CommandLine.COMMANDS),
+            default="unfollow-nonfollowers",
+            help="default command for accounts that don't name one",
+        )
+        accounts.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            help="Chrome instances at once (MAX_BROWSERS)",
+        )
+        return parser
+
+    def answers(self):
+        args = self.args
+        answers = {
+            "username": args.account.lstrip("@"),
+            "confirm": "y" if args.yes else "n",
+        }
+        if args.command in ("collect", "export"):
+            answers["list_type"] = args.list
+        if args.command == "export":
+            answers["format"] = args.format
+        if args.command == "diff":
+            paths = {
+                role: getattr(args, role)
+                for role in ["followers", "following", "previous"]
+            }
+            answers.update(paths)
+            answers["sources"] = "n" if any(paths.values()) else "y"
+        return answers
+
+    def overrides(self, menu):
+        overrides = dict(self.settings)
+        if getattr(self.args, "limit", None):
+            overrides["MAX_SAFE_LIMIT"] = self.args.limit
+        if self.args.headless:
+            overrides.update(LEAN_BROWSER=True, HEADLESS_AFTER_LOGIN=True)
+        for item in self.args.set:
+            key, _, value = item.partition("=")
+            key = key.strip().upper()
+            if key not in DEFAULT_SETTINGS:
+                raise ValueError(f"Unknown setting: {key}")
+            overrides[key] = menu.parse_setting(key, value.strip())
+        return overrides
+
+    def run(self):
+        if not self.args.command:
+            SystemSetup().run()
+            return 0
+        system = SystemSetup(self.log_file)
+        try:
+            if not system.deps_ready:
+                system.log(
+                    f"❗Missing packages: {', '.join(system.deps.missing())}. Run the menu's dependency check first.",
+                    level="error",
+                    style="red",
+                )
+                return 2
+            menu = MainMenu(
+                system.console,
+                system.logger,
+                system.cmd,
+                system.logo,
+                system.deps,
+                system,
+            )
+            try:
+                menu.overrides = self.overrides(menu)
+            except ValueError as e:
+                system.log(f"❌ Invalid --set value: {e}", level="error", style="red")
+                return 2
+            system.logger.info(f"Batch run: {' '.join(self.argv)}")
+            if self.args.command == "run-accounts":
+                return AccountOrchestrator(
+                    system.console,
+                    system.logger,
+                    self.args,
+                    menu.load_settings(announce=False),
+                ).run()
+            menu.answers = self.answers()
+            try:
+                ok = getattr(menu, self.COMMANDS[self.args.command])()
+            except KeyboardInterrupt:
+                system.log("✋ Interrupted.", level="warning", style="red")
+                return 130
+            except Exception as e:
+                system.console.print(f"[red]❌ {self.args.command} failed:[/red] {e}")
+                system.logger.exception(f"Batch run {self.args.command} failed")
+                return 1
+            finally:
+                self.summary = menu.last_summary
+            return 0 if ok else 1
+        finally:
+            system.log_manager.cleanup()
+
+
+class AccountOrchestrator:
+    # Runs one CommandLine subcommand per account of an accounts file, each in
+    # its own spawned process with its own Chrome profile and log. Journals,
+    # target lists and rate budgets are already kept per account. At most
+    # `workers` accounts, and so Chrome instances, run at once.
+    LOG_DIR = os.path.join("log", "accounts")
+    PROFILE_DIR = "chrome_profiles"
+
+    def __init__(self, console, logger, args, settings):
+        self.console = console
+        self.logger = logger
+        self.path = args.file
+        self.command = args.default_command
+        self.workers = max(1, args.workers or settings.get("MAX_BROWSERS", 2))
+        # Flags given to run-accounts apply to every account.
+        self.options = (["--yes"] if args.yes else []) + (
+            ["--headless"] if args.headless else []
+        )
+        for item in args.set:
+            self.options += ["--set", item]
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        if isinstance(entries, dict):
+            entries = entries.get("accounts", [])
+        jobs = []
+        seen = set()
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"account": entry}
+            account = str(entry.get("account", "")).strip().lstrip("@")
+            if not account:
+                raise ValueError("every entry needs an account")
+            key = account.lower()
+            if key in seen:
+                raise ValueError(f"{account} is listed twice")
+            seen.add(key)
+            command = entry.get("command", self.command)
+            argv = [command, "-a", account] + list(entry.get("args", [])) + self.options
+            if command not in CommandLine.COMMANDS:
+                raise ValueError(f"unknown command for {account}: {command}")
+            try:
+                CommandLine.parser().parse_args(argv)
+            except SystemExit:
+                raise ValueError(f"invalid args for {account}: {' '.join(argv)}")
+            settings = dict(entry.get("settings", {}))
+            unknown = [k for k in settings if k not in DEFAULT_SETTINGS]
+            if unknown:
+                raise ValueError(
+                    f"unknown settings for {account}: {', '.join(unknown)}"
+                )
+            settings.setdefault(
+                "CHROME_PROFILE_DIR", os.path.join(self.PROFILE_DIR, key)
+            )
+            # The daemon's state file is shared, so each worker owns its Chrome.
+            settings.update(BROWSER_DAEMON=False, PARALLEL_SCANS=1)
+            jobs.append(
+                {
+                    "account": account,
+                    "command": command,
+                    "argv": argv,
+                    "settings": settings,
+                    "log_file": os.path.join("accounts", f"{key}.log"),
+                    "console_file": os.path.join(self.LOG_DIR, f"{key}.console.txt"),
+                }
+            )
+        return jobs
+
+    @staticmethod
+    def run_account(job):
+        # Worker process: console output, chromedriver's included, goes to the
+        # account's console file instead of the shared terminal.
+        os.makedirs(os.path.dirname(job["console_file"]), exist_ok=True)
+        out = open(job["console_file"], "a", encoding="utf-8", buffering=1)
+        out.write(f"\n=== {datetime.now():%Y-%m-%d %H:%M:%S} {' '.join(job['argv'])}\n")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(out.fileno(), 1)
+        os.dup2(out.fileno(), 2)
+        sys.stdout = sys.stderr = out
+        started = time.monotonic()
+        cli = CommandLine(job["argv"], job["settings"], job["log_file"])
+        code = cli.run()
+        summary = cli.summary or {}
+        return {
+            "account": job["account"],
+            "command": job["command"],
+            "code": code,
+            "secs": round(time.monotonic() - started, 1),
+            "counts": summary.get("counts", {}),
+        }
+
+    def report(self, results):
+        os.makedirs(os.path.join(".meta", "metrics"), exist_ok=True)
+        path = os.path.join(
+            ".meta",
+            "metrics",
+            f"accounts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        self.console.print(
+            "\n[bold bright_white]📋 Accounts summary[/bold bright_white]"
+        )
+        for result in results:
+            counts = ", ".join(f"{k}: {v}" for k, v in result["counts"].items())
+            ok = result["code"] == 0
+            self.console.print(
+                f"[{'green' if ok else 'red'}]{'✅' if ok else '❌'} @{result['account']} "
+                f"{result['command']} (exit {result['code']}, {result['secs']:.0f}s)"
+                f"{' ' + counts if counts else ''}{' ' + result['error'] if result.get('error') else ''}"
+                f"[/{'green' if ok else 'red'}]"
+            )
+        self.console.print(
+            f"[cyan]📈 Results saved to {path}. Logs are in {self.LOG_DIR}/.[/cyan]"
+        )
+        self.logger.info(f"Accounts summary saved to {path}")
+
+    def run(self):
+        try:
+            jobs = self.load()
+        except (OSError, ValueError) as e:
+            self.console.print(f"[red]❌ Could not read accounts file: {e}[/red]")
+            return 2
+        if not jobs:
+            self.console.print("[red]❌ No accounts in the accounts file.[/red]")
+            return 2
+        workers = min(self.workers, len(jobs))
+        self.console.print(
+            f"[yellow]🚀 Running {len(jobs)} accounts, {workers} at a time...[/yellow]"
+        )
+        results = {}
+        # spawn: workers must not inherit the logging thread and locks.
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            futures = {pool.submit(self.run_account, job): job for job in jobs}
+            for future in concurrent.futures.as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        "account": job["account"],
+                        "command": job["command"],
+                        "code": 1,
+                        "secs": 0,
+                        "counts": {},
+                        "error": str(e) or type(e).__name__,
+                    }
+                results[job["account"]] = result
+                self.logger.info(
+                    f"Account {job['account']} finished with exit code {result['code']}"
+                )
+                self.console.print(
+                    f"[cyan]🏁 @{job['account']} done ({len(results)}/{len(jobs)})[/cyan]"
+                )
+        except KeyboardInterrupt:
+            self.console.print(
+                "[red]✋ Interrupted. Waiting for running accounts to stop...[/red]"
+            )
+            pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            pool.shutdown()
+        self.report(
+            [results[job["account"]] for job in jobs if job["account"] in results]
+        )
+        if len(results) < len(jobs):
+            return 130
+        return 0 if all(r["code"] == 0 for r in results.values()) else 1
 
+
+if __name__ == "__main__":
+    sys.exit(CommandLine().run())